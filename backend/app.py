@@ -3,13 +3,22 @@ from flask_cors import CORS
 import os
 import json
 import logging
+import time
+import pandas as pd
 from dotenv import load_dotenv
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Import custom modules
 from models.predictor import ChurnPredictor
 from database.db import init_db, get_session, close_session
-from database.models import Customer, Prediction, Strategy
-from utils.helpers import validate_customer_data, format_prediction_response, prepare_customer_data_for_db
+from database.models import Customer, Prediction, Strategy, LatestPrediction
+from database.search import search_customers
+from database.strategy_catalog import sync_strategy_catalog, get_strategy_sets
+from utils.helpers import (
+    validate_customer_data, format_prediction_response, prepare_customer_data_for_db,
+    validate_search_params, validate_scenario_request, build_scenario_grid
+)
+from utils.admission import AdmissionController, parse_request_start
 
 # Load environment variables
 load_dotenv()
@@ -25,12 +34,28 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Only behind a trusted reverse proxy may X-Forwarded-For set the client address
+trusted_proxies = int(os.getenv('TRUSTED_PROXY_COUNT', 0))
+if trusted_proxies > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies)
+
 # Initialize database
 init_db()
 
 # Initialize predictor
 predictor = ChurnPredictor()
 
+# Register retention strategies in the strategy catalog
+catalog_session = get_session()
+try:
+    strategy_set_ids = sync_strategy_catalog(catalog_session, predictor.strategies)
+    catalog_session.commit()
+finally:
+    close_session(catalog_session)
+
+# Initialize overload protection for the prediction endpoint
+admission = AdmissionController.from_env()
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
@@ -45,6 +70,39 @@ def health_check():
 def predict_churn():
     """
     Endpoint for predicting customer churn.
+    
+    Requests pass through admission control first: clients over their rate
+    limit get a 429, and requests that cannot start within the queue budget
+    are shed with a 503. Both carry a Retry-After header.
+    """
+    # Identify the client for rate limiting by its address, never by headers
+    # the client controls (see TRUSTED_PROXY_COUNT for running behind a proxy)
+    client_id = request.remote_addr
+    request_start = parse_request_start(request.headers.get('X-Request-Start'))
+    
+    rejection = admission.admit(client_id, request_start)
+    if rejection:
+        response = jsonify({
+            'error': rejection.reason,
+            'message': f"Please retry after {rejection.retry_after} second(s)"
+        })
+        response.headers['Retry-After'] = str(rejection.retry_after)
+        return response, rejection.status
+    
+    degraded = admission.should_degrade()
+    start = time.perf_counter()
+    try:
+        return _predict_churn(degraded)
+    finally:
+        admission.release((time.perf_counter() - start) * 1000, full_pipeline=not degraded)
+
+def _predict_churn(degraded):
+    """
+    Run the prediction pipeline for an admitted /predict request.
+    
+    When degraded, the customer's most recent stored prediction is served
+    (with "source": "stored" and its original prediction time) if one exists;
+    otherwise the model runs but the result is not persisted.
     """
     try:
         # Get customer data from request
@@ -58,6 +116,20 @@ def predict_churn():
                 'message': error_message
             }), 400
         
+        if degraded:
+            # Serve the stored prediction if we have one
+            prediction_result = get_stored_prediction(customer_data.get('customer_id'))
+            stored = prediction_result is not None
+            if not stored:
+                prediction_result = predictor.predict(customer_data)
+            admission.record_degraded(stored)
+            
+            response = format_prediction_response(
+                prediction_result, customer_data, source='stored' if stored else 'model'
+            )
+            response['degraded'] = True
+            return jsonify(response)
+        
         # Make prediction
         prediction_result = predictor.predict(customer_data)
         
@@ -76,6 +148,76 @@ def predict_churn():
             'message': str(e)
         }), 500
 
+@app.route('/predict/scenarios', methods=['POST'])
+def predict_scenarios():
+    """
+    Endpoint for what-if analysis of one customer.
+    
+    Expands the perturbation grid into one row per scenario, scores the
+    baseline and all scenarios with a single batched model call, and returns
+    the churn probability and risk segment of each. Nothing is stored.
+    """
+    try:
+        # Get scenario request
+        data = request.json
+        
+        # Validate scenario request
+        feature_names = getattr(predictor.model, 'feature_names_in_', None)
+        is_valid, error_message = validate_scenario_request(
+            data, feature_names=list(feature_names) if feature_names is not None else None
+        )
+        if not is_valid:
+            return jsonify({
+                'error': 'Invalid scenario request',
+                'message': error_message
+            }), 400
+        
+        customer_data = data['customer']
+        scenarios, changes = build_scenario_grid(customer_data, data['perturbations'])
+        
+        # Score baseline (first row) and scenarios together
+        batch = pd.concat([pd.DataFrame([customer_data]), scenarios], ignore_index=True)
+        probabilities, segments = predictor.predict_batch(batch)
+        baseline_probability = float(probabilities[0])
+        
+        # Format response
+        changes = {field: values.tolist() for field, values in changes.items()}
+        probabilities = probabilities[1:].tolist()
+        segments = segments[1:].tolist()
+        results = []
+        for i, probability in enumerate(probabilities):
+            results.append({
+                'changes': {field: values[i] for field, values in changes.items()},
+                'churn_probability': probability,
+                'risk_segment': segments[i],
+                'probability_change': probability - baseline_probability
+            })
+        
+        return jsonify({
+            'customer_id': customer_data.get('customer_id', 'unknown'),
+            'baseline': {
+                'churn_probability': baseline_probability,
+                'risk_segment': predictor._assign_risk_segment(baseline_probability)
+            },
+            'model_version': predictor.model_version,
+            'count': len(results),
+            'scenarios': results
+        })
+    
+    except Exception as e:
+        logger.error(f"Error in predict_scenarios: {str(e)}")
+        return jsonify({
+            'error': 'Scenario prediction failed',
+            'message': str(e)
+        }), 500
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Endpoint for admission control metrics (shed, rate-limited and degraded counts).
+    """
+    return jsonify(admission.snapshot())
+
 @app.route('/strategies', methods=['GET'])
 def get_strategies():
     """
@@ -144,19 +286,31 @@ def get_customer(customer_id):
             'predictions': []
         }
         
-        # Add predictions to response
-        for prediction in predictions:
-            # Query strategies for prediction
-            strategies = session.query(Strategy).filter_by(prediction_id=prediction.id).all()
-            
-            # Format strategies
-            formatted_strategies = []
+        # Resolve strategy sets, and legacy strategy rows for unmigrated predictions
+        strategy_sets = get_strategy_sets(
+            session, {p.strategy_set_id for p in predictions if p.strategy_set_id is not None}
+        )
+        legacy_strategies = {}
+        legacy_ids = [p.id for p in predictions if p.strategy_set_id is None]
+        if legacy_ids:
+            strategies = (
+                session.query(Strategy)
+                .filter(Strategy.prediction_id.in_(legacy_ids))
+                .order_by(Strategy.id)
+            )
             for strategy in strategies:
-                formatted_strategies.append({
+                legacy_strategies.setdefault(strategy.prediction_id, []).append({
                     'name': strategy.strategy_name,
                     'description': strategy.strategy_description,
                     'priority': strategy.priority
                 })
+        
+        # Add predictions to response
+        for prediction in predictions:
+            if prediction.strategy_set_id is not None:
+                formatted_strategies = strategy_sets.get(prediction.strategy_set_id, [])
+            else:
+                formatted_strategies = legacy_strategies.get(prediction.id, [])
             
             # Add prediction to response
             response['predictions'].append({
@@ -179,6 +333,99 @@ def get_customer(customer_id):
             'message': str(e)
         }), 500
 
+@app.route('/customers', methods=['GET'])
+def list_customers():
+    """
+    Endpoint for searching customers by their latest prediction.
+    
+    Supports filtering by risk segment, contract, CLTV and churn probability,
+    sorting, and cursor-based pagination via the returned next_cursor.
+    """
+    try:
+        # Validate query parameters
+        is_valid, error_message, params = validate_search_params(request.args)
+        if not is_valid:
+            return jsonify({
+                'error': 'Invalid search parameters',
+                'message': error_message
+            }), 400
+        
+        # Get database session
+        session = get_session()
+        
+        # Fetch one page of results
+        try:
+            rows, next_cursor = search_customers(session, **params)
+        except ValueError as e:
+            close_session(session)
+            return jsonify({
+                'error': 'Invalid search parameters',
+                'message': str(e)
+            }), 400
+        
+        # Format response
+        customers = []
+        for latest, customer_id in rows:
+            customers.append({
+                'customer_id': customer_id,
+                'contract': latest.contract,
+                'cltv': latest.cltv,
+                'churn_probability': latest.churn_probability,
+                'risk_segment': latest.risk_segment,
+                'prediction_time': latest.prediction_time.isoformat(),
+                'model_version': latest.model_version
+            })
+        
+        close_session(session)
+        return jsonify({
+            'customers': customers,
+            'count': len(customers),
+            'next_cursor': next_cursor
+        })
+    
+    except Exception as e:
+        logger.error(f"Error in list_customers: {str(e)}")
+        if 'session' in locals():
+            close_session(session)
+        return jsonify({
+            'error': 'Failed to search customers',
+            'message': str(e)
+        }), 500
+
+def get_stored_prediction(customer_id):
+    """
+    Get a customer's most recent stored prediction.
+    
+    Args:
+        customer_id (str): Customer ID
+        
+    Returns:
+        dict: Prediction result in the format of ChurnPredictor.predict, or None
+    """
+    if not customer_id:
+        return None
+    
+    session = get_session()
+    try:
+        latest = (
+            session.query(LatestPrediction)
+            .join(Customer, Customer.id == LatestPrediction.customer_id)
+            .filter(Customer.customer_id == customer_id)
+            .first()
+        )
+        if not latest:
+            return None
+        
+        return {
+            'churn_probability': latest.churn_probability,
+            'risk_segment': latest.risk_segment,
+            'retention_strategies': predictor.strategies.get(latest.risk_segment, []),
+            'model_version': latest.model_version,
+            'prediction_time': latest.prediction_time
+        }
+    finally:
+        close_session(session)
+
 def store_prediction(customer_data, prediction_result):
     """
     Store customer data and prediction in database.
@@ -210,19 +457,24 @@ def store_prediction(customer_data, prediction_result):
             customer_id=customer.id,
             churn_probability=prediction_result['churn_probability'],
             risk_segment=prediction_result['risk_segment'],
-            model_version=prediction_result['model_version']
+            model_version=prediction_result['model_version'],
+            strategy_set_id=strategy_set_ids.get(prediction_result['risk_segment'])
         )
         session.add(prediction)
-        session.flush()  # Flush to get prediction ID
-        
-        # Create strategies
-        for i, strategy_name in enumerate(prediction_result['retention_strategies']):
-            strategy = Strategy(
-                prediction_id=prediction.id,
-                strategy_name=strategy_name,
-                priority=i + 1
-            )
-            session.add(strategy)
+        session.flush()  # Flush to get prediction ID and time
+        
+        # Keep the customer's latest prediction current for search
+        latest = session.get(LatestPrediction, customer.id)
+        if not latest:
+            latest = LatestPrediction(customer_id=customer.id)
+            session.add(latest)
+        latest.prediction_id = prediction.id
+        latest.churn_probability = prediction.churn_probability
+        latest.risk_segment = prediction.risk_segment
+        latest.model_version = prediction.model_version
+        latest.prediction_time = prediction.prediction_time
+        latest.contract = customer.contract
+        latest.cltv = customer.cltv
         
         # Commit changes
         session.commit()
@@ -0,0 +1,136 @@
+"""
+Benchmark customer search over the latest prediction table.
+
+Generates a synthetic database, prints the query plan for each search and
+reports latency percentiles for the first page and for deep cursor pages.
+
+Usage (from the backend directory):
+    python -m benchmarks.customer_search --customers 1000000
+"""
+import argparse
+import datetime
+import os
+import tempfile
+import time
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Customer, Prediction, LatestPrediction
+from database.search import build_search_query, search_customers
+
+RISK_SEGMENTS = ['Low Risk', 'Medium-Low Risk', 'Medium Risk', 'Medium-High Risk', 'High Risk']
+CONTRACTS = ['Month-to-Month', 'One Year', 'Two Year']
+
+SCENARIOS = {
+    'high_risk_m2m_cltv_gt_5000': dict(risk_segment='High Risk', contract='Month-to-Month', min_cltv=5000),
+    'high_risk_by_probability': dict(risk_segment='High Risk'),
+    'm2m_by_cltv': dict(contract='Month-to-Month', sort_by='cltv'),
+    'all_by_probability': dict(),
+    'probability_band': dict(min_probability=0.6, max_probability=0.7)
+}
+
+def populate(engine, num_customers, seed=42, chunk_size=100000):
+    """
+    Insert synthetic customers with one prediction each.
+
+    Args:
+        engine (Engine): Target database engine
+        num_customers (int): Number of customers to generate
+        seed (int): Random seed
+        chunk_size (int): Rows per insert batch
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.datetime.utcnow()
+
+    with engine.begin() as conn:
+        for start in range(0, num_customers, chunk_size):
+            n = min(chunk_size, num_customers - start)
+            ids = np.arange(start + 1, start + n + 1)
+            probability = rng.random(n)
+            segment = np.minimum((probability * 5).astype(int), 4)
+            contract = rng.integers(0, len(CONTRACTS), n)
+            cltv = rng.integers(2000, 7000, n).astype(float)
+            seconds = rng.integers(0, 86400 * 90, n)
+
+            conn.execute(insert(Customer), [
+                {'id': int(i), 'customer_id': f"C{i:09d}", 'contract': CONTRACTS[c], 'cltv': float(v)}
+                for i, c, v in zip(ids, contract, cltv)
+            ])
+            predictions = [
+                {'id': int(i), 'customer_id': int(i), 'churn_probability': float(p),
+                 'risk_segment': RISK_SEGMENTS[s], 'model_version': 'benchmark',
+                 'prediction_time': now - datetime.timedelta(seconds=int(t))}
+                for i, p, s, t in zip(ids, probability, segment, seconds)
+            ]
+            conn.execute(insert(Prediction), predictions)
+            conn.execute(insert(LatestPrediction), [
+                {'customer_id': p['customer_id'], 'prediction_id': p['id'],
+                 'churn_probability': p['churn_probability'], 'risk_segment': p['risk_segment'],
+                 'model_version': p['model_version'], 'prediction_time': p['prediction_time'],
+                 'contract': CONTRACTS[c], 'cltv': float(v)}
+                for p, c, v in zip(predictions, contract, cltv)
+            ])
+
+def explain(session, criteria):
+    """
+    Return the database query plan for a search.
+    """
+    query = build_search_query(session, **criteria).limit(51)
+    statement = query.statement.compile(session.bind, compile_kwargs={'literal_binds': True})
+    prefix = 'EXPLAIN QUERY PLAN ' if session.bind.dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = session.connection().exec_driver_sql(prefix + str(statement)).fetchall()
+    return [str(row[-1]) for row in rows]
+
+def time_pages(session, criteria, pages, repeats, limit):
+    """
+    Time the first page and the following cursor pages of a search.
+
+    Returns:
+        tuple: (first page latencies in ms, deep page latencies in ms)
+    """
+    first, deep = [], []
+    for _ in range(repeats):
+        cursor = None
+        for page in range(pages):
+            start = time.perf_counter()
+            rows, cursor = search_customers(session, limit=limit, cursor=cursor, **criteria)
+            elapsed = (time.perf_counter() - start) * 1000
+            (first if page == 0 else deep).append(elapsed)
+            if cursor is None:
+                break
+    return first, deep
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--customers', type=int, default=1000000)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--database-url', help='Existing database to benchmark (skips data generation)')
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'search_benchmark.db')
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        populate(engine, args.customers)
+        print(f"Generated {args.customers:,} customers in {time.perf_counter() - start:.1f}s ({path})")
+        with engine.begin() as conn:
+            conn.exec_driver_sql('ANALYZE')
+
+    session = sessionmaker(bind=engine)()
+    for name, criteria in SCENARIOS.items():
+        print(f"\n== {name}: {criteria}")
+        for line in explain(session, criteria):
+            print(f"   plan: {line}")
+        first, deep = time_pages(session, criteria, args.pages, args.repeats, args.limit)
+        print(f"   first page  p50={np.percentile(first, 50):.2f}ms p99={np.percentile(first, 99):.2f}ms")
+        if deep:
+            print(f"   cursor page p50={np.percentile(deep, 50):.2f}ms p99={np.percentile(deep, 99):.2f}ms")
+    session.close()
+
+if __name__ == '__main__':
+    main()
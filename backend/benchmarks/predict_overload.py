@@ -0,0 +1,173 @@
+"""
+Load test /predict at a multiple of its measured capacity.
+
+Measures the sustainable throughput of the endpoint with a closed loop,
+then drives an open-loop arrival rate of --overload times that capacity
+with and without admission control. Each request carries an
+X-Request-Start header stamped at its arrival time, as the proxy would,
+and latency is measured from arrival so that queueing is included.
+
+Requires a trained model in models/best_churn_model.joblib.
+
+Usage (from the backend directory):
+    python -m benchmarks.predict_overload --duration 20 --overload 3
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Benchmark against a throwaway database
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'overload_benchmark.db')}"
+
+import app as api
+from utils.admission import AdmissionController
+
+CONTRACTS = ['Month-to-Month', 'One Year', 'Two Year']
+INTERNET_SERVICES = ['DSL', 'Fiber Optic', 'Cable', 'No']
+
+def make_payload(rng, customer_number):
+    """
+    Build a /predict request body for a synthetic customer.
+    """
+    return {
+        'customer_id': f"LOAD{customer_number:06d}",
+        'gender': str(rng.choice(['Male', 'Female'])),
+        'age': int(rng.integers(18, 80)),
+        'tenure_months': int(rng.integers(1, 72)),
+        'contract': str(rng.choice(CONTRACTS)),
+        'monthly_charge': round(float(rng.uniform(20, 150)), 2),
+        'internet_service': str(rng.choice(INTERNET_SERVICES)),
+        'cltv': int(rng.integers(2000, 7000))
+    }
+
+class LoadClient:
+    """
+    Thread-safe wrapper issuing /predict requests through Flask test clients.
+    """
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.local = threading.local()
+        self.counter = 0
+        self.lock = threading.Lock()
+
+    def next_payload(self):
+        with self.lock:
+            self.counter += 1
+            return self.payloads[self.counter % len(self.payloads)]
+
+    def send(self, arrival):
+        """
+        Send one request that arrived at the given Unix time.
+
+        Returns:
+            tuple: (HTTP status, latency since arrival in ms, degraded flag)
+        """
+        if not hasattr(self.local, 'client'):
+            self.local.client = api.app.test_client()
+        response = self.local.client.post(
+            '/predict',
+            json=self.next_payload(),
+            headers={'X-Request-Start': f"t={arrival:.3f}"}
+        )
+        degraded = response.status_code == 200 and response.get_json().get('degraded', False)
+        return response.status_code, (time.time() - arrival) * 1000, degraded
+
+def measure_capacity(client, workers, duration):
+    """
+    Measure throughput with a fixed number of back-to-back workers.
+
+    Returns:
+        float: Completed requests per second
+    """
+    deadline = time.time() + duration
+    completed = Counter()
+
+    def worker():
+        while time.time() < deadline:
+            status, _, _ = client.send(time.time())
+            completed[status] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return completed[200] / duration
+
+def open_loop(client, rate, duration, pool_size):
+    """
+    Issue requests at a fixed arrival rate regardless of completions.
+
+    Returns:
+        list: (status, latency in ms, degraded flag) per request
+    """
+    results = []
+    interval = 1.0 / rate
+    with ThreadPoolExecutor(max_workers=pool_size) as pool:
+        futures = []
+        start = time.time()
+        for i in range(int(rate * duration)):
+            arrival = start + i * interval
+            delay = arrival - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(client.send, arrival))
+        for future in futures:
+            results.append(future.result())
+    return results
+
+def summarize(label, results):
+    statuses = Counter(status for status, _, _ in results)
+    latencies = np.array([latency for _, latency, _ in results])
+    ok = np.array([latency for status, latency, _ in results if status == 200])
+    degraded = sum(1 for _, _, is_degraded in results if is_degraded)
+    print(f"\n== {label}")
+    print(f"   responses: {dict(statuses)} (degraded: {degraded})")
+    print(f"   all      p50={np.percentile(latencies, 50):.0f}ms p99={np.percentile(latencies, 99):.0f}ms "
+          f"max={latencies.max():.0f}ms")
+    if len(ok):
+        print(f"   200 only p50={np.percentile(ok, 50):.0f}ms p99={np.percentile(ok, 99):.0f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per load phase')
+    parser.add_argument('--overload', type=float, default=3, help='Arrival rate as a multiple of capacity')
+    parser.add_argument('--workers', type=int, default=4, help='Closed-loop workers for capacity')
+    parser.add_argument('--pool-size', type=int, default=32, help='Request handler threads')
+    parser.add_argument('--customers', type=int, default=500)
+    parser.add_argument('--max-concurrency', type=int, default=4)
+    parser.add_argument('--max-queue-ms', type=float, default=250)
+    parser.add_argument('--latency-slo-ms', type=float, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    client = LoadClient([make_payload(rng, i) for i in range(args.customers)])
+
+    # Unprotected baseline: no limits and no degraded mode
+    api.admission = AdmissionController(max_concurrency=0, max_queue_ms=0)
+
+    # Warm up and store one prediction per customer
+    for _ in range(args.customers):
+        client.send(time.time())
+
+    capacity = measure_capacity(client, args.workers, args.duration / 2)
+    rate = capacity * args.overload
+    print(f"Capacity: {capacity:.0f} req/s, offered load: {rate:.0f} req/s for {args.duration:.0f}s")
+
+    summarize('without admission control', open_loop(client, rate, args.duration, args.pool_size))
+
+    api.admission = AdmissionController(
+        max_concurrency=args.max_concurrency,
+        max_queue_ms=args.max_queue_ms,
+        latency_slo_ms=args.latency_slo_ms
+    )
+    summarize('with admission control', open_loop(client, rate, args.duration, args.pool_size))
+    print(f"   metrics: {api.admission.snapshot()['counters']}")
+
+if __name__ == '__main__':
+    main()
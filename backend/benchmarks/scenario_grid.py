@@ -0,0 +1,92 @@
+"""
+Benchmark the what-if scenario endpoint against sequential predictions.
+
+For each grid size, times POST /predict/scenarios end to end (validation,
+grid expansion, one batched predict_proba and JSON serialization) and
+compares it with calling ChurnPredictor.predict once per scenario, which
+is what a client looping over /predict would cost before persistence.
+
+Requires a trained model in models/best_churn_model.joblib.
+
+Usage (from the backend directory):
+    python -m benchmarks.scenario_grid
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+# Benchmark against a throwaway database
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scenario_benchmark.db')}"
+
+import app as api
+from utils.helpers import build_scenario_grid
+
+CUSTOMER = {
+    'customer_id': 'SCENARIO1',
+    'gender': 'Female',
+    'age': 42,
+    'tenure_months': 8,
+    'contract': 'Month-to-Month',
+    'monthly_charge': 95.5,
+    'internet_service': 'Fiber Optic'
+}
+
+def make_perturbations(num_scenarios):
+    """
+    Build a contract x monthly charge x tenure grid with about num_scenarios cells.
+    """
+    contracts = ['Month-to-Month', 'One Year', 'Two Year']
+    charge_steps = max(1, int(np.sqrt(num_scenarios / len(contracts))))
+    tenure_steps = max(1, num_scenarios // (len(contracts) * charge_steps))
+    return {
+        'contract': contracts,
+        'monthly_charge': {'scale': np.linspace(0.7, 1.0, charge_steps).round(4).tolist()},
+        'tenure_months': np.linspace(1, 72, tenure_steps).round().tolist()
+    }
+
+def time_call(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000, 10000])
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--sequential-sample', type=int, default=200,
+                        help='Scenarios timed sequentially; the total is extrapolated')
+    args = parser.parse_args()
+
+    client = api.app.test_client()
+
+    for size in args.sizes:
+        perturbations = make_perturbations(size)
+        body = {'customer': dict(CUSTOMER), 'perturbations': perturbations}
+
+        def batched():
+            response = client.post('/predict/scenarios', json=body)
+            assert response.status_code == 200, response.get_json()
+            return response
+
+        count = batched().get_json()['count']
+        timings = time_call(batched, args.repeats)
+
+        # Time a sample of sequential single-row predictions
+        scenarios, _ = build_scenario_grid(dict(CUSTOMER), perturbations)
+        rows = scenarios.head(args.sequential_sample).to_dict(orient='records')
+        start = time.perf_counter()
+        for row in rows:
+            api.predictor.predict(row)
+        per_row = (time.perf_counter() - start) * 1000 / len(rows)
+
+        print(f"{count:>6} scenarios: endpoint p50={np.percentile(timings, 50):7.1f}ms "
+              f"p99={np.percentile(timings, 99):7.1f}ms | sequential predict ~{per_row * count:9.1f}ms "
+              f"({per_row:.2f}ms/scenario)")
+
+if __name__ == '__main__':
+    main()
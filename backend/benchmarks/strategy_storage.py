@@ -0,0 +1,127 @@
+"""
+Compare storage size and insert throughput of the legacy per-prediction
+strategy rows with strategy sets from the strategy catalog.
+
+Writes the same predictions into two SQLite databases: the legacy layout
+(one strategies row per recommended action) and the catalog layout (one
+strategy_set_id per prediction). Bulk inserts are timed for the full run;
+single-prediction transactions, as issued by /predict, are timed on a sample.
+
+Usage (from the backend directory):
+    python -m benchmarks.strategy_storage --predictions 1000000
+"""
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Customer, Prediction, Strategy
+from database.strategy_catalog import sync_strategy_catalog
+
+STRATEGIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                               'models', 'retention_strategies.json')
+
+def create_database(path, legacy):
+    """
+    Create an empty database with one customer and, for the catalog layout, the strategy sets.
+
+    Returns:
+        tuple: (engine, risk segment -> strategy set id)
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    if legacy:
+        # The legacy schema had no index on strategies.prediction_id
+        with engine.begin() as conn:
+            conn.exec_driver_sql('DROP INDEX ix_strategies_prediction_id')
+
+    with engine.begin() as conn:
+        conn.execute(insert(Customer), [{'id': 1, 'customer_id': 'BENCH1'}])
+
+    set_ids = {}
+    if not legacy:
+        session = sessionmaker(bind=engine)()
+        set_ids = sync_strategy_catalog(session, load_strategies())
+        session.commit()
+        session.close()
+    return engine, set_ids
+
+def load_strategies():
+    with open(STRATEGIES_PATH, 'r') as f:
+        return json.load(f)
+
+def make_rows(start_id, segments, strategies, set_ids, legacy, now):
+    """
+    Build prediction rows and, for the legacy layout, their strategy rows.
+    """
+    predictions, strategy_rows = [], []
+    for offset, segment in enumerate(segments):
+        prediction_id = start_id + offset
+        predictions.append({
+            'id': prediction_id, 'customer_id': 1, 'churn_probability': 0.5,
+            'risk_segment': segment, 'model_version': 'benchmark', 'prediction_time': now,
+            'strategy_set_id': None if legacy else set_ids[segment]
+        })
+        if legacy:
+            strategy_rows.extend(
+                {'prediction_id': prediction_id, 'strategy_name': name, 'priority': i + 1, 'created_at': now}
+                for i, name in enumerate(strategies[segment])
+            )
+    return predictions, strategy_rows
+
+def write(engine, segments, strategies, set_ids, legacy, batch_size):
+    """
+    Insert one prediction per segment entry in transactions of batch_size predictions.
+
+    Returns:
+        float: Predictions inserted per second
+    """
+    now = datetime.datetime.utcnow()
+    with engine.connect() as conn:
+        start_id = (conn.exec_driver_sql('SELECT COALESCE(MAX(id), 0) FROM predictions').scalar() or 0) + 1
+
+    start = time.perf_counter()
+    for offset in range(0, len(segments), batch_size):
+        predictions, strategy_rows = make_rows(
+            start_id + offset, segments[offset:offset + batch_size], strategies, set_ids, legacy, now
+        )
+        with engine.begin() as conn:
+            conn.execute(insert(Prediction), predictions)
+            if strategy_rows:
+                conn.execute(insert(Strategy), strategy_rows)
+    return len(segments) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--predictions', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--single-sample', type=int, default=5000,
+                        help='Predictions written one transaction each')
+    args = parser.parse_args()
+
+    strategies = load_strategies()
+    rng = np.random.default_rng(0)
+    segments = list(rng.choice(list(strategies), size=args.predictions))
+    sample = list(rng.choice(list(strategies), size=args.single_sample))
+    directory = tempfile.mkdtemp()
+
+    for label, legacy in (('legacy strategy rows', True), ('strategy catalog', False)):
+        path = os.path.join(directory, f"{'legacy' if legacy else 'catalog'}.db")
+        engine, set_ids = create_database(path, legacy)
+
+        bulk = write(engine, segments, strategies, set_ids, legacy, args.batch_size)
+        single = write(engine, sample, strategies, set_ids, legacy, 1)
+        engine.dispose()
+
+        print(f"\n== {label}")
+        print(f"   bulk insert:            {bulk:,.0f} predictions/sec")
+        print(f"   single-row transaction: {single:,.0f} predictions/sec")
+        print(f"   database size:          {os.path.getsize(path) / 2**20:,.1f} MiB "
+              f"({args.predictions + args.single_sample:,} predictions)")
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, func, exists, insert, inspect
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.ext.declarative import declarative_base
 import os
 from dotenv import load_dotenv
-from .models import Base
+from .models import Base, Customer, Prediction, LatestPrediction, Strategy
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +23,64 @@ def init_db():
     Initialize the database by creating all tables.
     """
     Base.metadata.create_all(engine)
+    
+    # create_all() does not add new columns or indexes to tables that already exist
+    prediction_columns = {column['name'] for column in inspect(engine).get_columns('predictions')}
+    if 'strategy_set_id' not in prediction_columns:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                'ALTER TABLE predictions ADD COLUMN strategy_set_id INTEGER REFERENCES strategy_sets(id)'
+            )
+    for table in (Customer.__table__, Prediction.__table__, Strategy.__table__):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    
+    # Populate the latest prediction table for databases created before it existed
+    session = get_session()
+    try:
+        has_latest = session.query(exists().where(LatestPrediction.customer_id.isnot(None))).scalar()
+        has_predictions = session.query(exists().where(Prediction.id.isnot(None))).scalar()
+        if has_predictions and not has_latest:
+            refresh_latest_predictions(session)
+            session.commit()
+    finally:
+        close_session(session)
+
+def refresh_latest_predictions(session):
+    """
+    Rebuild the latest prediction table from the full prediction history.
+    
+    Args:
+        session (Session): Database session (the caller commits)
+    """
+    latest_ids = (
+        select(func.max(Prediction.id).label('prediction_id'))
+        .group_by(Prediction.customer_id)
+        .subquery()
+    )
+    rows = (
+        select(
+            Prediction.customer_id,
+            Prediction.id,
+            Prediction.churn_probability,
+            Prediction.risk_segment,
+            Prediction.model_version,
+            func.coalesce(Prediction.prediction_time, func.current_timestamp()),
+            Customer.contract,
+            Customer.cltv
+        )
+        .join(latest_ids, Prediction.id == latest_ids.c.prediction_id)
+        .join(Customer, Customer.id == Prediction.customer_id)
+    )
+    
+    session.execute(LatestPrediction.__table__.delete())
+    session.execute(
+        insert(LatestPrediction).from_select(
+            ['customer_id', 'prediction_id', 'churn_probability', 'risk_segment',
+             'model_version', 'prediction_time', 'contract', 'cltv'],
+            rows
+        )
+    )
 
 def get_session():
     """
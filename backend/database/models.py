@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import datetime
@@ -31,19 +31,23 @@ class Customer(Base):
     streaming_movies = Column(Boolean)
     streaming_music = Column(Boolean)
     unlimited_data = Column(Boolean)
-    contract = Column(String(20))
+    contract = Column(String(20), index=True)
     paperless_billing = Column(Boolean)
     payment_method = Column(String(30))
     monthly_charge = Column(Float)
     total_charges = Column(Float)
     satisfaction_score = Column(Integer)
-    cltv = Column(Float)
+    cltv = Column(Float, index=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     
     # Relationship with predictions
     predictions = relationship("Prediction", back_populates="customer", cascade="all, delete-orphan")
     
+    # Relationship with the materialized latest prediction
+    latest_prediction = relationship("LatestPrediction", back_populates="customer", uselist=False,
+                                     cascade="all, delete-orphan")
+    
     def __repr__(self):
         return f"<Customer(id={self.id}, customer_id='{self.customer_id}')>"
 
@@ -55,30 +59,76 @@ class Prediction(Base):
     __tablename__ = 'predictions'
     
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey('customers.id'), nullable=False)
+    customer_id = Column(Integer, ForeignKey('customers.id'), nullable=False, index=True)
     churn_probability = Column(Float, nullable=False)
     risk_segment = Column(String(20), nullable=False)
     model_version = Column(String(50))
     prediction_time = Column(DateTime, default=datetime.datetime.utcnow)
+    strategy_set_id = Column(Integer, ForeignKey('strategy_sets.id'))
     
     # Relationship with customer
     customer = relationship("Customer", back_populates="predictions")
     
-    # Relationship with strategies
+    # Relationship with the recommended strategy set
+    strategy_set = relationship("StrategySet")
+    
+    # Relationship with legacy per-prediction strategy rows
     strategies = relationship("Strategy", back_populates="prediction", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Prediction(id={self.id}, churn_probability={self.churn_probability:.2f}, risk_segment='{self.risk_segment}')>"
 
 
+class StrategyCatalogEntry(Base):
+    """
+    Catalog of retention strategies, versioned by the strategies file they were loaded from.
+    """
+    __tablename__ = 'strategy_catalog'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(String(20), nullable=False)
+    name = Column(String(100), nullable=False)
+    description = Column(Text)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('version', 'name', name='uq_strategy_catalog_version_name'),
+    )
+    
+    def __repr__(self):
+        return f"<StrategyCatalogEntry(id={self.id}, version='{self.version}', name='{self.name}')>"
+
+
+class StrategySet(Base):
+    """
+    Ordered set of catalog strategies recommended together, referenced by predictions.
+    """
+    __tablename__ = 'strategy_sets'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(String(20), nullable=False)
+    risk_segment = Column(String(20))
+    strategy_ids = Column(String(200), nullable=False)  # Catalog ids in priority order, e.g. "3,1,7"
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('version', 'strategy_ids', name='uq_strategy_sets_version_ids'),
+    )
+    
+    def __repr__(self):
+        return f"<StrategySet(id={self.id}, version='{self.version}', strategy_ids='{self.strategy_ids}')>"
+
+
 class Strategy(Base):
     """
     Strategy model representing retention strategies in the database.
+    
+    Legacy per-prediction rows; new predictions reference a StrategySet instead.
     """
     __tablename__ = 'strategies'
     
     id = Column(Integer, primary_key=True)
-    prediction_id = Column(Integer, ForeignKey('predictions.id'), nullable=False)
+    prediction_id = Column(Integer, ForeignKey('predictions.id'), nullable=False, index=True)
     strategy_name = Column(String(100), nullable=False)
     strategy_description = Column(Text)
     priority = Column(Integer)
@@ -88,4 +138,42 @@ class Strategy(Base):
     prediction = relationship("Prediction", back_populates="strategies")
     
     def __repr__(self):
-        return f"<Strategy(id={self.id}, strategy_name='{self.strategy_name}')>" 
\ No newline at end of file
+        return f"<Strategy(id={self.id}, strategy_name='{self.strategy_name}')>" 
+
+
+class LatestPrediction(Base):
+    """
+    Denormalized copy of each customer's most recent prediction.
+    
+    Kept current by the prediction write path so that customer search can
+    filter and sort on a single, indexed table instead of scanning the full
+    prediction history. The customer's contract and CLTV are materialized
+    alongside the prediction for the same reason.
+    """
+    __tablename__ = 'latest_predictions'
+    
+    customer_id = Column(Integer, ForeignKey('customers.id'), primary_key=True)
+    prediction_id = Column(Integer, ForeignKey('predictions.id'), nullable=False)
+    churn_probability = Column(Float, nullable=False)
+    risk_segment = Column(String(20), nullable=False)
+    model_version = Column(String(50))
+    prediction_time = Column(DateTime, nullable=False)
+    contract = Column(String(20))
+    cltv = Column(Float)
+    
+    # Composite indexes ending in customer_id so that keyset pagination
+    # (sort value, customer_id) can be served straight from the index
+    __table_args__ = (
+        Index('ix_latest_predictions_risk_probability', 'risk_segment', 'churn_probability', 'customer_id'),
+        Index('ix_latest_predictions_risk_contract_cltv', 'risk_segment', 'contract', 'cltv', 'customer_id'),
+        Index('ix_latest_predictions_contract_cltv', 'contract', 'cltv', 'customer_id'),
+        Index('ix_latest_predictions_probability', 'churn_probability', 'customer_id'),
+        Index('ix_latest_predictions_cltv', 'cltv', 'customer_id'),
+        Index('ix_latest_predictions_time', 'prediction_time', 'customer_id'),
+    )
+    
+    # Relationship with customer
+    customer = relationship("Customer", back_populates="latest_prediction")
+    
+    def __repr__(self):
+        return f"<LatestPrediction(customer_id={self.customer_id}, risk_segment='{self.risk_segment}')>"
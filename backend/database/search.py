@@ -0,0 +1,147 @@
+import base64
+import datetime
+import json
+from sqlalchemy import tuple_
+from .models import Customer, LatestPrediction
+
+# Columns of the latest prediction table that results can be sorted by
+SORT_COLUMNS = {
+    'churn_probability': LatestPrediction.churn_probability,
+    'cltv': LatestPrediction.cltv,
+    'prediction_time': LatestPrediction.prediction_time
+}
+
+def encode_cursor(sort_by, value, customer_pk):
+    """
+    Encode the position of the last returned row as an opaque cursor.
+
+    Args:
+        sort_by (str): Sort column the cursor belongs to
+        value: Sort column value of the last row
+        customer_pk (int): Primary key of the last row's customer
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, value, customer_pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, sort_by):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor string
+        sort_by (str): Sort column of the current request
+
+    Returns:
+        tuple: (sort value, customer primary key)
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another sort column
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort_by, value, customer_pk = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_by == 'prediction_time':
+            value = datetime.datetime.fromisoformat(value)
+        elif value is not None:
+            value = float(value)
+        customer_pk = int(customer_pk)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+    if cursor_sort_by != sort_by:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort_by}', not '{sort_by}'")
+
+    return value, customer_pk
+
+def build_search_query(session, risk_segment=None, contract=None, min_cltv=None, max_cltv=None,
+                       min_probability=None, max_probability=None, sort_by='churn_probability',
+                       order='desc', cursor=None):
+    """
+    Build the customer search query over the latest prediction table.
+
+    Results are ordered by (sort column, customer primary key) so that a
+    cursor can resume with an indexed range condition instead of an OFFSET.
+    Customers without a CLTV are excluded when sorting by CLTV.
+
+    Args:
+        session (Session): Database session
+        risk_segment (str): Exact risk segment to match
+        contract (str): Exact contract type to match
+        min_cltv (float): Minimum CLTV (inclusive)
+        max_cltv (float): Maximum CLTV (inclusive)
+        min_probability (float): Minimum churn probability (inclusive)
+        max_probability (float): Maximum churn probability (inclusive)
+        sort_by (str): One of SORT_COLUMNS
+        order (str): 'asc' or 'desc'
+        cursor (str): Cursor returned by a previous page
+
+    Returns:
+        Query: Query yielding (LatestPrediction, customer_id) rows
+    """
+    sort_column = SORT_COLUMNS[sort_by]
+
+    query = session.query(LatestPrediction, Customer.customer_id).join(
+        Customer, Customer.id == LatestPrediction.customer_id
+    )
+
+    # Apply filters
+    if risk_segment is not None:
+        query = query.filter(LatestPrediction.risk_segment == risk_segment)
+    if contract is not None:
+        query = query.filter(LatestPrediction.contract == contract)
+    if min_cltv is not None:
+        query = query.filter(LatestPrediction.cltv >= min_cltv)
+    if max_cltv is not None:
+        query = query.filter(LatestPrediction.cltv <= max_cltv)
+    if min_probability is not None:
+        query = query.filter(LatestPrediction.churn_probability >= min_probability)
+    if max_probability is not None:
+        query = query.filter(LatestPrediction.churn_probability <= max_probability)
+    if sort_by == 'cltv':
+        query = query.filter(LatestPrediction.cltv.isnot(None))
+
+    # Resume after the last row of the previous page
+    if cursor is not None:
+        value, customer_pk = decode_cursor(cursor, sort_by)
+        position = tuple_(sort_column, LatestPrediction.customer_id)
+        if order == 'desc':
+            query = query.filter(position < tuple_(value, customer_pk))
+        else:
+            query = query.filter(position > tuple_(value, customer_pk))
+
+    if order == 'desc':
+        query = query.order_by(sort_column.desc(), LatestPrediction.customer_id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), LatestPrediction.customer_id.asc())
+
+    return query
+
+def search_customers(session, limit=50, **criteria):
+    """
+    Fetch one page of customers matching the search criteria.
+
+    Args:
+        session (Session): Database session
+        limit (int): Maximum number of results in the page
+        **criteria: Filters, sort and cursor accepted by build_search_query
+
+    Returns:
+        tuple: (list of (LatestPrediction, customer_id) rows, next cursor or None)
+    """
+    sort_by = criteria.get('sort_by', 'churn_probability')
+
+    # Fetch one extra row to know whether another page exists
+    rows = build_search_query(session, **criteria).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_cursor = encode_cursor(sort_by, getattr(last, sort_by), last.customer_id)
+
+    return rows, next_cursor
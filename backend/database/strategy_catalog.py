@@ -0,0 +1,225 @@
+import argparse
+import hashlib
+import json
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from .models import Prediction, Strategy, StrategyCatalogEntry, StrategySet
+
+# Version assigned to strategies and sets found only in migrated legacy rows
+LEGACY_VERSION = 'legacy'
+
+# Strategy sets never change once created, so resolved sets are cached per process
+_strategy_set_cache = {}
+
+def catalog_version(strategies):
+    """
+    Derive a catalog version from the contents of the retention strategies.
+
+    Args:
+        strategies (dict): Retention strategies by risk segment
+
+    Returns:
+        str: Short content hash, identical for identical strategy files
+    """
+    canonical = json.dumps(strategies, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+def _get_or_create(session, model, defaults=None, **keys):
+    """
+    Fetch a row by its unique keys, creating it if it does not exist.
+
+    Tolerates another worker creating the same row concurrently.
+    """
+    instance = session.query(model).filter_by(**keys).first()
+    if instance:
+        return instance
+
+    instance = model(**keys, **(defaults or {}))
+    try:
+        with session.begin_nested():
+            session.add(instance)
+    except IntegrityError:
+        instance = session.query(model).filter_by(**keys).one()
+    return instance
+
+def _get_or_create_set(session, version, risk_segment, entry_ids):
+    return _get_or_create(
+        session, StrategySet,
+        defaults={'risk_segment': risk_segment},
+        version=version,
+        strategy_ids=','.join(str(entry_id) for entry_id in entry_ids)
+    )
+
+def _split_strategy_ids(strategy_ids):
+    # Sets stored before empty segments were skipped have strategy_ids == ''
+    return [int(entry_id) for entry_id in strategy_ids.split(',') if entry_id]
+
+def sync_strategy_catalog(session, strategies):
+    """
+    Register the retention strategies in the catalog.
+
+    Adds catalog entries and one strategy set per risk segment for the
+    current catalog version; existing rows are reused. Segments without
+    strategies get no set, so their predictions store no strategy set id.
+
+    Args:
+        session (Session): Database session (the caller commits)
+        strategies (dict): Retention strategies by risk segment
+
+    Returns:
+        dict: Risk segment -> strategy set id
+    """
+    version = catalog_version(strategies)
+
+    set_ids = {}
+    for risk_segment, names in strategies.items():
+        if not names:
+            continue
+        entry_ids = [
+            _get_or_create(session, StrategyCatalogEntry, version=version, name=name).id
+            for name in names
+        ]
+        set_ids[risk_segment] = _get_or_create_set(session, version, risk_segment, entry_ids).id
+
+    return set_ids
+
+def get_strategy_sets(session, set_ids):
+    """
+    Resolve strategy sets to their strategies.
+
+    Args:
+        session (Session): Database session
+        set_ids (iterable): Strategy set ids
+
+    Returns:
+        dict: Strategy set id -> list of {'name', 'description', 'priority'}
+    """
+    missing = {set_id for set_id in set_ids if set_id not in _strategy_set_cache}
+    if missing:
+        strategy_sets = session.query(StrategySet).filter(StrategySet.id.in_(missing)).all()
+        entry_ids = {
+            entry_id
+            for strategy_set in strategy_sets
+            for entry_id in _split_strategy_ids(strategy_set.strategy_ids)
+        }
+        entries = {
+            entry.id: entry
+            for entry in session.query(StrategyCatalogEntry).filter(StrategyCatalogEntry.id.in_(entry_ids))
+        }
+
+        for strategy_set in strategy_sets:
+            _strategy_set_cache[strategy_set.id] = [
+                {
+                    'name': entries[entry_id].name,
+                    'description': entries[entry_id].description,
+                    'priority': i + 1
+                }
+                for i, entry_id in enumerate(_split_strategy_ids(strategy_set.strategy_ids))
+            ]
+
+    return {set_id: _strategy_set_cache[set_id] for set_id in set_ids if set_id in _strategy_set_cache}
+
+def migrate_legacy_strategies(session, strategies, batch_size=10000):
+    """
+    Move per-prediction strategy rows onto strategy sets.
+
+    Each prediction's strategies are matched, in priority order, to catalog
+    entries of the current version; names not in the current catalog get
+    'legacy' entries. The prediction then references the matching strategy
+    set and its strategy rows are deleted. Commits after every batch so the
+    migration can be interrupted and resumed.
+
+    Args:
+        session (Session): Database session
+        strategies (dict): Current retention strategies by risk segment
+        batch_size (int): Predictions migrated per transaction
+
+    Returns:
+        int: Number of predictions migrated
+    """
+    version = catalog_version(strategies)
+    sync_strategy_catalog(session, strategies)
+    session.commit()
+
+    entry_ids = {}
+    set_ids = {}
+    migrated = 0
+    last_id = 0
+
+    while True:
+        # Next batch of predictions that still have legacy strategy rows
+        prediction_ids = [
+            row[0] for row in session.query(Strategy.prediction_id)
+            .filter(Strategy.prediction_id > last_id)
+            .distinct()
+            .order_by(Strategy.prediction_id)
+            .limit(batch_size)
+        ]
+        if not prediction_ids:
+            break
+
+        rows = (
+            session.query(Strategy.prediction_id, Strategy.strategy_name, Strategy.strategy_description,
+                          Prediction.risk_segment)
+            .join(Prediction, Prediction.id == Strategy.prediction_id)
+            .filter(Strategy.prediction_id.in_(prediction_ids))
+            .order_by(Strategy.prediction_id, Strategy.priority, Strategy.id)
+        )
+
+        # Group strategy names per prediction, in priority order
+        grouped = {}
+        for prediction_id, name, description, risk_segment in rows:
+            grouped.setdefault(prediction_id, (risk_segment, []))[1].append((name, description))
+
+        updates = []
+        for prediction_id, (risk_segment, named) in grouped.items():
+            ids = []
+            for name, description in named:
+                if name not in entry_ids:
+                    entry = session.query(StrategyCatalogEntry).filter_by(version=version, name=name).first()
+                    if not entry:
+                        entry = _get_or_create(session, StrategyCatalogEntry, defaults={'description': description},
+                                               version=LEGACY_VERSION, name=name)
+                    entry_ids[name] = entry.id
+                ids.append(entry_ids[name])
+
+            key = tuple(ids)
+            if key not in set_ids:
+                existing = session.query(StrategySet).filter_by(
+                    strategy_ids=','.join(str(entry_id) for entry_id in ids)
+                ).first()
+                set_ids[key] = (existing or _get_or_create_set(session, LEGACY_VERSION, risk_segment, ids)).id
+            updates.append({'id': prediction_id, 'strategy_set_id': set_ids[key]})
+
+        session.bulk_update_mappings(Prediction, updates)
+        session.execute(delete(Strategy).where(Strategy.prediction_id.in_(prediction_ids)))
+        session.commit()
+
+        migrated += len(prediction_ids)
+        last_id = prediction_ids[-1]
+
+    return migrated
+
+if __name__ == '__main__':
+    # Usage (from the backend directory): python -m database.strategy_catalog
+    import os
+    from .db import init_db, get_session, close_session
+
+    parser = argparse.ArgumentParser(description='Migrate legacy strategy rows to the strategy catalog.')
+    parser.add_argument('--strategies-path', default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        'models', 'retention_strategies.json'
+    ))
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    with open(args.strategies_path, 'r') as f:
+        strategies = json.load(f)
+
+    init_db()
+    session = get_session()
+    try:
+        count = migrate_legacy_strategies(session, strategies, args.batch_size)
+        print(f"Migrated {count:,} predictions to the strategy catalog")
+    finally:
+        close_session(session)
@@ -104,6 +104,32 @@ class ChurnPredictor:
             'model_version': self.model_version
         }
     
+    def predict_batch(self, df):
+        """
+        Score many customer rows with a single model call.
+        
+        Args:
+            df (pd.DataFrame): Customer data, one row per customer or scenario
+            
+        Returns:
+            tuple: (churn probabilities as np.ndarray, risk segments as np.ndarray)
+        """
+        probabilities = self.model.predict_proba(df)[:, 1]
+        return probabilities, self._assign_risk_segments(probabilities)
+    
+    def _assign_risk_segments(self, probabilities):
+        """
+        Vectorized version of _assign_risk_segment.
+        
+        Args:
+            probabilities (np.ndarray): Churn probabilities
+            
+        Returns:
+            np.ndarray: Risk segment per probability
+        """
+        segments = np.array(['Low Risk', 'Medium-Low Risk', 'Medium Risk', 'Medium-High Risk', 'High Risk'])
+        return segments[np.digitize(probabilities, [0.2, 0.4, 0.6, 0.8])]
+    
     def _assign_risk_segment(self, probability):
         """
         Assign a risk segment based on churn probability.
@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Make the backend modules importable the same way app.py imports them
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Point the application at a throwaway database and disable the overload
+# limits from .env before any backend module reads the environment
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ['PREDICT_RATE_LIMIT'] = '0'
+os.environ['PREDICT_LATENCY_SLO_MS'] = '0'
+
+from database.models import Base
+
+
+def train_model():
+    """
+    Train a small churn model on the /predict fields.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'gender': rng.choice(['Male', 'Female'], n),
+        'age': rng.integers(18, 80, n).astype(float),
+        'tenure_months': rng.integers(1, 72, n).astype(float),
+        'contract': rng.choice(['Month-to-Month', 'One Year', 'Two Year'], n),
+        'monthly_charge': rng.uniform(20, 150, n),
+        'internet_service': rng.choice(['DSL', 'Fiber Optic', 'Cable', 'No'], n)
+    })
+    churn = ((df['contract'] == 'Month-to-Month') & (df['monthly_charge'] > 70)).astype(int)
+
+    preprocessor = ColumnTransformer([
+        ('categorical', OneHotEncoder(handle_unknown='ignore'), ['gender', 'contract', 'internet_service']),
+        ('numeric', 'passthrough', ['age', 'tenure_months', 'monthly_charge'])
+    ])
+    return Pipeline([('preprocessor', preprocessor), ('classifier', LogisticRegression(max_iter=1000))]).fit(df, churn)
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    """
+    The Flask application module, loaded with a freshly trained model.
+    """
+    from models.predictor import ChurnPredictor
+
+    model = train_model()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ChurnPredictor, '_load_model', lambda self, model_path: model)
+        import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """
+    Session on an empty database with all tables created.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'session.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def customer_data():
+    return {
+        'customer_id': 'TEST1',
+        'gender': 'Female',
+        'age': 42,
+        'tenure_months': 8,
+        'contract': 'Month-to-Month',
+        'monthly_charge': 95.5,
+        'internet_service': 'Fiber Optic'
+    }
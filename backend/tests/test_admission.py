@@ -0,0 +1,191 @@
+import time
+import pytest
+from database.models import Customer, LatestPrediction
+from utils.admission import AdmissionController, TokenBucket, parse_request_start
+
+
+def test_token_bucket_allows_burst_then_limits():
+    bucket = TokenBucket(rate=1, burst=2)
+    now = bucket.updated
+    assert bucket.consume(now) == 0
+    assert bucket.consume(now) == 0
+    assert bucket.consume(now) == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=2, burst=1)
+    now = bucket.updated
+    assert bucket.consume(now) == 0
+    assert bucket.consume(now + 0.1) > 0
+    assert bucket.consume(now + 0.6) == 0
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('t=1700000000.5', 1700000000.5),
+    ('1700000000500', 1700000000.5),
+    ('1700000000500000', 1700000000.5),
+    ('garbage', None),
+    (None, None)
+])
+def test_parse_request_start(header, expected):
+    assert parse_request_start(header) == expected
+
+
+def test_rate_limit_is_per_client():
+    controller = AdmissionController(max_concurrency=0, rate_limit=1, rate_burst=1)
+    assert controller.admit('a') is None
+    rejection = controller.admit('a')
+    assert rejection.status == 429
+    assert rejection.retry_after >= 1
+    assert controller.admit('b') is None
+    assert controller.counters['rate_limited'] == 1
+
+
+def test_sheds_when_queue_budget_spent_upstream():
+    controller = AdmissionController(max_queue_ms=100, retry_after=3)
+    rejection = controller.admit('a', request_start=time.time() - 0.5)
+    assert rejection.status == 503
+    assert rejection.retry_after == 3
+    assert controller.counters['shed_queue_time'] == 1
+
+
+def test_sheds_when_no_slot_frees_within_budget():
+    controller = AdmissionController(max_concurrency=1, max_queue_ms=50)
+    assert controller.admit('a') is None
+    rejection = controller.admit('b')
+    assert rejection.status == 503
+    assert controller.counters['shed_concurrency'] == 1
+
+    controller.release(1.0)
+    assert controller.admit('b') is None
+
+
+def fill_window(controller, latency_ms, count=20):
+    for _ in range(count):
+        assert controller.admit('a') is None
+        controller.release(latency_ms)
+
+
+def test_enters_degraded_mode_above_slo():
+    controller = AdmissionController(latency_slo_ms=100)
+    fill_window(controller, 50)
+    assert not controller.degraded
+    fill_window(controller, 200, count=40)
+    assert controller.degraded
+
+
+def test_degraded_latencies_do_not_end_degraded_mode():
+    controller = AdmissionController(latency_slo_ms=100, min_degraded_seconds=0)
+    fill_window(controller, 200)
+    assert controller.degraded
+
+    for _ in range(100):
+        controller.admit('a')
+        controller.release(1.0, full_pipeline=False)
+    assert controller.degraded
+
+
+def test_probes_run_full_pipeline_while_degraded():
+    controller = AdmissionController(latency_slo_ms=100, probe_interval=5)
+    assert controller.should_degrade() is False
+    fill_window(controller, 200)
+    decisions = [controller.should_degrade() for _ in range(10)]
+    assert decisions.count(False) == 2
+
+
+def test_leaves_degraded_mode_after_fast_probes():
+    controller = AdmissionController(latency_slo_ms=100, min_degraded_seconds=0)
+    fill_window(controller, 200)
+    assert controller.degraded
+    fill_window(controller, 10)
+    assert not controller.degraded
+
+
+def test_degraded_mode_is_held_for_minimum_time():
+    controller = AdmissionController(latency_slo_ms=100, min_degraded_seconds=60)
+    fill_window(controller, 200)
+    fill_window(controller, 10)
+    assert controller.degraded
+
+
+def test_leaves_degraded_mode_on_low_traffic_after_spike():
+    controller = AdmissionController(latency_slo_ms=100, min_degraded_seconds=0.05, probe_interval=10)
+    fill_window(controller, 200)
+    assert controller.degraded
+
+    # Far fewer requests than a full window of probes once the spike is over
+    time.sleep(0.06)
+    for _ in range(3):
+        degraded = controller.should_degrade()
+        assert controller.admit('a') is None
+        controller.release(10, full_pipeline=not degraded)
+    assert not controller.degraded
+
+
+def test_probes_at_least_once_per_hold_period():
+    controller = AdmissionController(latency_slo_ms=100, min_degraded_seconds=0.05, probe_interval=1000)
+    fill_window(controller, 200)
+    assert controller.should_degrade() is True
+    time.sleep(0.06)
+    assert controller.should_degrade() is False
+    assert controller.should_degrade() is True
+
+
+@pytest.mark.parametrize('header', ['X-Client-Id', 'X-Real-IP', 'X-Forwarded-For'])
+def test_client_headers_do_not_bypass_rate_limit(app_module, client, customer_data, header):
+    app_module.admission = AdmissionController(rate_limit=1, rate_burst=2)
+    try:
+        statuses = [
+            client.post('/predict', json=customer_data, headers={header: f"10.0.0.{i}"}).status_code
+            for i in range(6)
+        ]
+        buckets = len(app_module.admission._buckets)
+    finally:
+        app_module.admission = AdmissionController.from_env()
+    assert statuses.count(429) == 4
+    assert buckets == 1
+
+
+def test_trusted_proxy_sets_client_address(app_module, client, customer_data, monkeypatch):
+    from werkzeug.middleware.proxy_fix import ProxyFix
+
+    monkeypatch.setattr(app_module.app, 'wsgi_app', ProxyFix(app_module.app.wsgi_app, x_for=1))
+    app_module.admission = AdmissionController(rate_limit=1, rate_burst=1)
+    try:
+        # The proxy appends the real client address to whatever the client sent
+        send = lambda spoofed, real: client.post(
+            '/predict', json=customer_data, headers={'X-Forwarded-For': f"{spoofed}, {real}"}
+        ).status_code
+        assert send('1.1.1.1', '10.0.0.1') == 200
+        assert send('2.2.2.2', '10.0.0.1') == 429
+        assert send('1.1.1.1', '10.0.0.2') == 200
+    finally:
+        app_module.admission = AdmissionController.from_env()
+
+
+def test_degraded_response_serves_stored_prediction(app_module, client, customer_data):
+    stored = client.post('/predict', json=customer_data).get_json()['prediction']
+    assert stored['source'] == 'model'
+
+    app_module.admission = AdmissionController(latency_slo_ms=100, probe_interval=1000)
+    fill_window(app_module.admission, 200)
+    try:
+        response = client.post('/predict', json=dict(customer_data, contract='Two Year')).get_json()
+    finally:
+        app_module.admission = AdmissionController.from_env()
+
+    session = app_module.get_session()
+    try:
+        latest = (
+            session.query(LatestPrediction)
+            .join(Customer, Customer.id == LatestPrediction.customer_id)
+            .filter(Customer.customer_id == customer_data['customer_id'])
+            .one()
+        )
+    finally:
+        app_module.close_session(session)
+
+    assert response['degraded'] is True
+    assert response['prediction']['source'] == 'stored'
+    assert response['prediction']['churn_probability'] == stored['churn_probability']
+    assert response['prediction']['prediction_time'] == latest.prediction_time.isoformat()
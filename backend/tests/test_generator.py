@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+from utils.helpers import validate_customer_data
+
+# The generator lives in data/ and imports the backend as a package from the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'data'))
+sys.path.insert(0, ROOT_DIR)
+
+import generator
+from backend.database.models import Customer
+
+
+def count_customers(database_url):
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(Customer)).scalar()
+    finally:
+        engine.dispose()
+
+
+def test_chunk_is_deterministic():
+    first = generator.generate_chunk(1, 500, seed=7, chunk_index=3)
+    second = generator.generate_chunk(1, 500, seed=7, chunk_index=3)
+    pd.testing.assert_frame_equal(first, second)
+
+    other_chunk = generator.generate_chunk(1, 500, seed=7, chunk_index=4)
+    assert not first['Age'].equals(other_chunk['Age'])
+
+
+def test_chunk_seed_depends_on_start_id():
+    first = generator.generate_chunk(1, 500, seed=7)
+    appended = generator.generate_chunk(501, 500, seed=7)
+    assert not first['Age'].equals(appended['Age'])
+
+
+def test_churn_ratio():
+    chunk = generator.generate_chunk(1, 20000, seed=1, churn_ratio=0.3)
+    assert chunk['Churn Value'].mean() == pytest.approx(0.3, abs=0.01)
+    assert ((chunk['Churn Label'] == 'Yes') == (chunk['Churn Value'] == 1)).all()
+    assert ((chunk['Customer Status'] == 'Churned') == (chunk['Churn Value'] == 1)).all()
+
+
+def test_csv_is_identical_across_worker_counts(tmp_path):
+    outputs = []
+    for workers in (1, 3):
+        output = tmp_path / f"customers_{workers}.csv"
+        generator.generate(2500, output=str(output), seed=11, chunk_size=400, workers=workers)
+        outputs.append(output.read_bytes())
+
+    assert outputs[0] == outputs[1]
+    assert len(pd.read_csv(tmp_path / 'customers_1.csv')) == 2500
+
+
+def test_payloads_pass_predict_validation(tmp_path):
+    output = tmp_path / 'payloads.jsonl'
+    generator.generate(200, output_format='payloads', output=str(output), seed=3, chunk_size=64, workers=2)
+
+    payloads = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(payloads) == 200
+    assert len({payload['customer_id'] for payload in payloads}) == 200
+    for payload in payloads:
+        assert validate_customer_data(payload) == (True, "")
+        assert payload['contract'] in generator.CONTRACTS
+        assert isinstance(payload['paperless_billing'], bool)
+
+
+def test_insert_customers_reports_overlap(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'customers.db'}")
+    Customer.metadata.create_all(engine)
+    records = generator.to_api_records(generator.generate_chunk(1, 10, seed=5))
+    generator._insert_customers(engine, records)
+
+    with pytest.raises(ValueError, match='--start-id'):
+        generator._insert_customers(engine, records, inserted=20)
+    engine.dispose()
+
+
+def test_db_appends_new_customers_and_rejects_collisions(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'customers.db'}"
+    for _ in range(2):
+        generator.generate(300, output_format='db', database_url=database_url, seed=42, chunk_size=100, workers=2)
+    assert count_customers(database_url) == 600
+
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        rows = pd.read_sql(select(Customer.customer_id, Customer.age, Customer.monthly_charge), conn)
+    engine.dispose()
+    assert sorted(rows['customer_id'].astype(int)) == list(range(1, 601))
+    # Appended customers are new draws, not copies of the first run
+    first, second = rows.iloc[:300], rows.iloc[300:]
+    assert not (first['monthly_charge'].to_numpy() == second['monthly_charge'].to_numpy()).all()
+
+    # Only the last chunk collides, but nothing is inserted
+    with pytest.raises(ValueError, match='--start-id'):
+        generator.generate(300, output_format='db', database_url=database_url, start_id=401,
+                           chunk_size=100, workers=1)
+    assert count_customers(database_url) == 600
+
+
+def test_parquet_refuses_non_empty_directory(tmp_path):
+    (tmp_path / 'part-00099.parquet').write_bytes(b'')
+    with pytest.raises(ValueError, match='not empty'):
+        generator.generate(10, output_format='parquet', output=str(tmp_path))
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from utils.helpers import build_scenario_grid, validate_scenario_request
+
+
+def scenario_request(customer_data, **perturbations):
+    return {'customer': dict(customer_data), 'perturbations': perturbations}
+
+
+def test_grid_expands_to_cartesian_product(customer_data):
+    df, changes = build_scenario_grid(customer_data, {
+        'contract': ['One Year', 'Two Year'],
+        'monthly_charge': {'scale': [0.5, 1.0, 2.0]},
+        'tenure_months': [12, 24]
+    })
+
+    assert len(df) == 12
+    combinations = set(zip(df['contract'], df['monthly_charge'], df['tenure_months']))
+    assert combinations == {
+        (contract, charge, tenure)
+        for contract in ['One Year', 'Two Year']
+        for charge in [47.75, 95.5, 191.0]
+        for tenure in [12.0, 24.0]
+    }
+    assert list(changes) == ['contract', 'monthly_charge', 'tenure_months']
+    np.testing.assert_array_equal(changes['monthly_charge'], df['monthly_charge'])
+    # Unperturbed fields keep the customer's values
+    assert (df['gender'] == 'Female').all()
+    assert (df['age'] == 42).all()
+
+
+def test_grid_converts_boolean_values(customer_data):
+    df, _ = build_scenario_grid(customer_data, {'paperless_billing': ['Yes', 'No', True]})
+    assert df['paperless_billing'].tolist() == [True, False, True]
+
+
+def test_valid_request(customer_data):
+    data = scenario_request(customer_data, contract=['Two Year'], monthly_charge={'scale': [0.9]})
+    assert validate_scenario_request(data) == (True, "")
+
+
+@pytest.mark.parametrize('customer_overrides, perturbations, message', [
+    ({}, {'favourite_colour': ['red']}, 'Unknown perturbation field'),
+    ({}, {'contract': ['Three Year']}, 'Invalid value for contract'),
+    ({}, {'gender': ['female']}, 'Invalid value for gender'),
+    ({}, {'paperless_billing': ['maybe']}, 'Invalid value for paperless_billing'),
+    ({}, {'age': [30, 'abc']}, 'Invalid value for age'),
+    ({}, {'age': [float('nan')]}, 'Invalid value for age'),
+    ({}, {'monthly_charge': {'scale': [float('inf')]}}, 'Invalid value for monthly_charge'),
+    ({}, {'monthly_charge': {'scale': [1e308]}}, 'out of range'),
+    ({'cltv': 'abc'}, {'cltv': {'scale': [0.9]}}, 'Invalid data type'),
+    ({'cltv': float('nan')}, {'cltv': {'scale': [0.9]}}, 'Invalid value for customer cltv'),
+    ({'tenure_months': None}, {'contract': ['Two Year']}, 'Invalid value for customer tenure_months'),
+    ({'age': float('inf')}, {'contract': ['Two Year']}, 'Invalid value for customer age'),
+    ({}, {'cltv': {'scale': [0.9]}}, 'Cannot scale missing field'),
+    ({}, {'contract': {'scale': [0.9]}}, 'Scaling is only supported'),
+    ({}, {'contract': []}, 'non-empty list'),
+    ({}, {}, 'Missing required field: perturbations'),
+    ({}, {'age': list(range(101)), 'tenure_months': list(range(100))}, 'Too many scenarios')
+])
+def test_invalid_requests(customer_data, customer_overrides, perturbations, message):
+    data = scenario_request(dict(customer_data, **customer_overrides), **perturbations)
+    is_valid, error_message = validate_scenario_request(data)
+    assert not is_valid
+    assert message in error_message
+
+
+def test_rejects_fields_the_model_does_not_use(customer_data):
+    data = scenario_request(customer_data, payment_method=['Credit Card'])
+    assert validate_scenario_request(data)[0]
+    is_valid, error_message = validate_scenario_request(data, feature_names=['contract', 'age'])
+    assert not is_valid
+    assert 'Unknown perturbation field: payment_method' in error_message
+
+
+def test_endpoint_scores_every_scenario(client, customer_data):
+    response = client.post('/predict/scenarios', json=scenario_request(
+        customer_data, contract=['Month-to-Month', 'Two Year'], monthly_charge={'scale': [0.5, 1.0]}
+    ))
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 4
+
+    # The unchanged scenario scores the same as the baseline
+    unchanged = [
+        s for s in body['scenarios']
+        if s['changes'] == {'contract': 'Month-to-Month', 'monthly_charge': 95.5}
+    ]
+    assert unchanged[0]['churn_probability'] == pytest.approx(body['baseline']['churn_probability'])
+
+
+def test_endpoint_rejects_fields_outside_model(client, customer_data):
+    # The test model is not trained on cltv
+    customer = dict(customer_data, cltv=5000)
+    response = client.post('/predict/scenarios', json=scenario_request(customer, cltv={'scale': [0.9]}))
+    assert response.status_code == 400
+    assert 'Unknown perturbation field: cltv' in response.get_json()['message']
+
+
+@pytest.mark.parametrize('field', ['tenure_months', 'age', 'monthly_charge'])
+def test_endpoint_rejects_missing_required_number(client, customer_data, field):
+    response = client.post('/predict/scenarios', json=scenario_request(
+        dict(customer_data, **{field: None}), contract=['Two Year']
+    ))
+    assert response.status_code == 400
+    assert f"customer {field}" in response.get_json()['message']
+
+
+def test_endpoint_rejects_non_numeric_base_value(client, customer_data):
+    response = client.post('/predict/scenarios', json=scenario_request(
+        dict(customer_data, monthly_charge='abc'), monthly_charge={'scale': [0.9]}
+    ))
+    assert response.status_code == 400
@@ -0,0 +1,185 @@
+import datetime
+import pytest
+from database.models import Customer, Prediction, LatestPrediction
+from database.db import refresh_latest_predictions
+from database.search import encode_cursor, decode_cursor, search_customers
+
+
+@pytest.fixture
+def populated_session(db_session):
+    """
+    30 customers whose probabilities and CLTVs take only a few distinct values.
+    """
+    now = datetime.datetime(2026, 1, 1)
+    for i in range(1, 31):
+        db_session.add(Customer(id=i, customer_id=f"C{i}", contract='Month-to-Month' if i % 2 else 'One Year'))
+        db_session.add(Prediction(id=i, customer_id=i, churn_probability=0.1, risk_segment='Low Risk'))
+        db_session.add(LatestPrediction(
+            customer_id=i,
+            prediction_id=i,
+            churn_probability=[0.25, 0.5, 0.85][i % 3],
+            risk_segment=['Medium-Low Risk', 'Medium Risk', 'High Risk'][i % 3],
+            prediction_time=now + datetime.timedelta(hours=i % 4),
+            contract='Month-to-Month' if i % 2 else 'One Year',
+            cltv=None if i == 30 else float(3000 + (i % 5) * 1000)
+        ))
+    db_session.commit()
+    return db_session
+
+
+def fetch_all_pages(session, limit, **criteria):
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = search_customers(session, limit=limit, cursor=cursor, **criteria)
+        ids.extend(latest.customer_id for latest, _ in rows)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor('churn_probability', 0.75, 12)
+    assert decode_cursor(cursor, 'churn_probability') == (0.75, 12)
+
+
+def test_cursor_round_trip_datetime():
+    timestamp = datetime.datetime(2026, 3, 4, 5, 6, 7)
+    cursor = encode_cursor('prediction_time', timestamp, 3)
+    assert decode_cursor(cursor, 'prediction_time') == (timestamp, 3)
+
+
+def test_cursor_rejects_other_sort():
+    cursor = encode_cursor('cltv', 5000.0, 1)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'churn_probability')
+
+
+@pytest.mark.parametrize('cursor', ['zzz', 'bm90IGpzb24', encode_cursor('cltv', 'abc', 1)])
+def test_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'cltv')
+
+
+@pytest.mark.parametrize('sort_by', ['churn_probability', 'cltv', 'prediction_time'])
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_paging_has_no_duplicates_or_gaps(populated_session, sort_by, order):
+    ids, pages = fetch_all_pages(populated_session, limit=7, sort_by=sort_by, order=order)
+
+    rows = populated_session.query(LatestPrediction).all()
+    if sort_by == 'cltv':
+        rows = [row for row in rows if row.cltv is not None]
+    expected = sorted(rows, key=lambda row: (getattr(row, sort_by), row.customer_id), reverse=order == 'desc')
+
+    assert ids == [row.customer_id for row in expected]
+    assert pages == -(-len(expected) // 7)
+
+
+def test_paging_with_filters(populated_session):
+    ids, _ = fetch_all_pages(populated_session, limit=2, risk_segment='High Risk',
+                             contract='Month-to-Month', min_cltv=4000)
+
+    expected = [
+        row for row in populated_session.query(LatestPrediction)
+        if row.risk_segment == 'High Risk' and row.contract == 'Month-to-Month'
+        and row.cltv is not None and row.cltv >= 4000
+    ]
+    assert sorted(ids) == sorted(row.customer_id for row in expected)
+    assert len(ids) == len(set(ids))
+
+
+def test_last_page_has_no_cursor(populated_session):
+    rows, cursor = search_customers(populated_session, limit=30)
+    assert len(rows) == 30
+    assert cursor is None
+
+
+def test_refresh_builds_latest_from_prediction_history(db_session):
+    for i in (1, 2):
+        db_session.add(Customer(id=i, customer_id=f"C{i}", contract='Two Year', cltv=1000.0 * i))
+    history = [(1, 1, 0.2), (2, 2, 0.4), (3, 1, 0.9), (4, 2, 0.1), (5, 1, 0.6)]
+    for prediction_id, customer_id, probability in history:
+        db_session.add(Prediction(id=prediction_id, customer_id=customer_id, churn_probability=probability,
+                                  risk_segment='Medium Risk', model_version='v1'))
+    db_session.commit()
+
+    refresh_latest_predictions(db_session)
+    db_session.commit()
+
+    latest = {row.customer_id: row for row in db_session.query(LatestPrediction)}
+    assert {customer_id: row.prediction_id for customer_id, row in latest.items()} == {1: 5, 2: 4}
+    assert latest[1].churn_probability == 0.6
+    assert latest[2].cltv == 2000.0
+    assert latest[2].contract == 'Two Year'
+    assert latest[1].prediction_time is not None
+
+
+def test_predict_keeps_latest_prediction_current(app_module, client, customer_data):
+    customer = dict(customer_data, customer_id='LATEST1')
+    first = client.post('/predict', json=customer).get_json()['prediction']
+    second = client.post('/predict', json=dict(customer, contract='Two Year', monthly_charge=25)).get_json()['prediction']
+    assert first['churn_probability'] != second['churn_probability']
+
+    session = app_module.get_session()
+    try:
+        stored = session.query(Customer).filter_by(customer_id='LATEST1').one()
+        newest = session.query(Prediction).filter_by(customer_id=stored.id).order_by(Prediction.id.desc()).first()
+        latest = session.get(LatestPrediction, stored.id)
+        assert session.query(LatestPrediction).filter_by(customer_id=stored.id).count() == 1
+        assert latest.prediction_id == newest.id
+        assert latest.churn_probability == second['churn_probability']
+        assert latest.risk_segment == second['risk_segment']
+        assert latest.prediction_time == newest.prediction_time
+    finally:
+        app_module.close_session(session)
+
+
+def test_customers_endpoint_pages_through_results(client, customer_data):
+    for i, charge in enumerate([30, 60, 90, 120]):
+        client.post('/predict', json=dict(customer_data, customer_id=f"SEARCH{i}", monthly_charge=charge))
+
+    customers, cursor = [], None
+    while True:
+        query = {'limit': 3, 'sort': 'churn_probability', 'order': 'desc'}
+        if cursor:
+            query['cursor'] = cursor
+        response = client.get('/customers', query_string=query)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['count'] == len(body['customers']) <= 3
+        customers.extend(body['customers'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    ids = [row['customer_id'] for row in customers]
+    assert len(ids) == len(set(ids))
+    assert {f"SEARCH{i}" for i in range(4)} <= set(ids)
+    probabilities = [row['churn_probability'] for row in customers]
+    assert probabilities == sorted(probabilities, reverse=True)
+
+
+def test_customers_endpoint_filters(client, customer_data):
+    client.post('/predict', json=dict(customer_data, customer_id='FILTER1', monthly_charge=140))
+    response = client.get('/customers', query_string={'min_probability': 0.5, 'contract': 'Month-to-Month'})
+    assert response.status_code == 200
+    rows = response.get_json()['customers']
+    assert 'FILTER1' in [row['customer_id'] for row in rows]
+    assert all(row['churn_probability'] >= 0.5 and row['contract'] == 'Month-to-Month' for row in rows)
+
+
+@pytest.mark.parametrize('query', [
+    {'sort': 'age'},
+    {'order': 'sideways'},
+    {'limit': 0},
+    {'limit': 501},
+    {'limit': 'many'},
+    {'cursor': 'zzz'},
+    {'cursor': encode_cursor('cltv', 5000.0, 1)},
+    {'min_probability': 'high'},
+    {'min_probability': 'nan'},
+    {'max_cltv': 'inf'}
+])
+def test_customers_endpoint_rejects_bad_parameters(client, query):
+    response = client.get('/customers', query_string=query)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid search parameters'
@@ -0,0 +1,88 @@
+import pytest
+from database import strategy_catalog
+from database.models import Customer, Prediction, Strategy, StrategySet
+from database.strategy_catalog import get_strategy_sets, migrate_legacy_strategies, sync_strategy_catalog
+
+
+@pytest.fixture(autouse=True)
+def empty_set_cache(monkeypatch):
+    """
+    Set ids are only unique per database, so don't share cached sets between tests.
+    """
+    monkeypatch.setattr(strategy_catalog, '_strategy_set_cache', {})
+
+
+def add_legacy_prediction(session, customer, risk_segment, strategy_names):
+    """
+    Store a prediction the way the pre-catalog write path did: one strategy row per strategy.
+    """
+    prediction = Prediction(customer_id=customer.id, churn_probability=0.5, risk_segment=risk_segment,
+                            model_version='legacy_model')
+    session.add(prediction)
+    session.flush()
+    for i, name in enumerate(strategy_names):
+        session.add(Strategy(prediction_id=prediction.id, strategy_name=name, priority=i + 1))
+    return prediction
+
+
+def test_migration_keeps_customer_response(app_module, client):
+    strategies = app_module.predictor.strategies
+    session = app_module.get_session()
+    try:
+        customer = Customer(customer_id='LEGACY1', gender='Male', age=50, contract='One Year')
+        session.add(customer)
+        session.flush()
+        add_legacy_prediction(session, customer, 'High Risk', strategies['High Risk'])
+        add_legacy_prediction(session, customer, 'High Risk', strategies['High Risk'])
+        # A strategy that has since been removed from the strategy file
+        add_legacy_prediction(session, customer, 'Low Risk', ['Retired offer'] + strategies['Low Risk'][:2])
+        add_legacy_prediction(session, customer, 'Low Risk', [])
+        session.commit()
+
+        before = client.get('/customer/LEGACY1').get_json()
+        migrated = migrate_legacy_strategies(session, strategies, batch_size=2)
+
+        assert migrated == 3
+        assert session.query(Strategy).count() == 0
+    finally:
+        app_module.close_session(session)
+
+    after = client.get('/customer/LEGACY1').get_json()
+    assert after == before
+    assert [len(p['strategies']) for p in after['predictions']] == [
+        len(strategies['High Risk']), len(strategies['High Risk']), 3, 0
+    ]
+
+
+def test_sync_skips_segments_without_strategies(db_session):
+    set_ids = sync_strategy_catalog(db_session, {'Low Risk': ['Regular check-ins'], 'High Risk': []})
+    db_session.commit()
+
+    assert list(set_ids) == ['Low Risk']
+    assert db_session.query(StrategySet).count() == 1
+
+
+def test_empty_strategy_set_resolves_to_no_strategies(db_session):
+    strategy_set = StrategySet(version='old', risk_segment='High Risk', strategy_ids='')
+    db_session.add(strategy_set)
+    db_session.commit()
+
+    assert get_strategy_sets(db_session, {strategy_set.id}) == {strategy_set.id: []}
+
+
+def test_customer_with_empty_strategy_set(app_module, client):
+    session = app_module.get_session()
+    try:
+        strategy_set = StrategySet(version='old', risk_segment='High Risk', strategy_ids='')
+        customer = Customer(customer_id='EMPTYSET1', gender='Female', age=30, contract='Two Year')
+        session.add_all([strategy_set, customer])
+        session.flush()
+        session.add(Prediction(customer_id=customer.id, churn_probability=0.9, risk_segment='High Risk',
+                               strategy_set_id=strategy_set.id))
+        session.commit()
+    finally:
+        app_module.close_session(session)
+
+    response = client.get('/customer/EMPTYSET1')
+    assert response.status_code == 200
+    assert response.get_json()['predictions'][0]['strategies'] == []
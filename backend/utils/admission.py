@@ -0,0 +1,318 @@
+import math
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+# Result of a rejected admission: HTTP status, reason and Retry-After seconds
+Rejection = namedtuple('Rejection', ['status', 'reason', 'retry_after'])
+
+def parse_request_start(header_value):
+    """
+    Parse a proxy X-Request-Start header into a Unix timestamp.
+
+    Accepts the nginx format ("t=1697712345.123") as well as plain
+    timestamps in seconds, milliseconds or microseconds.
+
+    Args:
+        header_value (str): Header value
+
+    Returns:
+        float: Request start time in seconds, or None if missing or malformed
+    """
+    if not header_value:
+        return None
+    try:
+        value = float(header_value.strip().lstrip('t='))
+    except ValueError:
+        return None
+
+    if value > 1e14:
+        return value / 1e6
+    if value > 1e11:
+        return value / 1e3
+    return value
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate.
+    """
+    def __init__(self, rate, burst):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            burst (float): Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        # Callers may pass a timestamp taken just before the bucket was created
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = max(self.updated, now)
+
+    def consume(self, now=None):
+        """
+        Take one token if available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now):
+        """
+        Check whether the bucket has fully refilled (and can be forgotten).
+        """
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class AdmissionController:
+    """
+    Overload protection for expensive endpoints.
+
+    Combines per-client token-bucket rate limiting, a concurrency limit with
+    queue-time-aware load shedding, and a latency tracker that switches the
+    endpoint into degraded mode while the latency SLO is breached. Only
+    full-pipeline latencies are tracked; while degraded, every
+    probe_interval-th request (and at least one request per
+    min_degraded_seconds) still runs the full pipeline so recovery can be
+    detected. Degraded mode is held for at least min_degraded_seconds, after
+    which it ends as soon as the probes seen so far are fast enough, so that
+    low traffic after a spike does not keep it on.
+    Limits apply per worker process.
+    """
+    def __init__(self, max_concurrency=16, max_queue_ms=1000, rate_limit=0, rate_burst=20,
+                 latency_slo_ms=0, retry_after=1, latency_window=200, max_clients=10000,
+                 min_degraded_seconds=5, probe_interval=10):
+        """
+        Initialize the AdmissionController.
+
+        Args:
+            max_concurrency (int): Requests processed at once (0 disables the limit)
+            max_queue_ms (float): Longest a request may wait before being shed
+            rate_limit (float): Requests per second per client (0 disables rate limiting)
+            rate_burst (float): Token bucket capacity per client
+            latency_slo_ms (float): Latency SLO that triggers degraded mode (0 disables it)
+            retry_after (int): Retry-After seconds sent with shed responses
+            latency_window (int): Number of recent requests used for latency percentiles
+            max_clients (int): Rate limiter buckets kept before idle ones are pruned
+            min_degraded_seconds (float): Shortest time degraded mode stays on
+            probe_interval (int): While degraded, one in this many requests runs the full pipeline
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_ms = max_queue_ms
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.latency_slo_ms = latency_slo_ms
+        self.retry_after = retry_after
+        self.max_clients = max_clients
+        self.min_degraded_seconds = min_degraded_seconds
+        self.probe_interval = probe_interval
+
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._buckets = {}
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self.degraded = False
+        self._degraded_since = None
+        self._degraded_requests = 0
+        self._last_probe = None
+
+        self.counters = {
+            'admitted': 0,
+            'rate_limited': 0,
+            'shed_queue_time': 0,
+            'shed_concurrency': 0,
+            'degraded_stored': 0,
+            'degraded_unpersisted': 0
+        }
+        self.in_flight = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a controller configured from PREDICT_* environment variables.
+        """
+        return cls(
+            max_concurrency=int(os.getenv('PREDICT_MAX_CONCURRENCY', 16)),
+            max_queue_ms=float(os.getenv('PREDICT_MAX_QUEUE_MS', 1000)),
+            rate_limit=float(os.getenv('PREDICT_RATE_LIMIT', 0)),
+            rate_burst=float(os.getenv('PREDICT_RATE_BURST', 20)),
+            latency_slo_ms=float(os.getenv('PREDICT_LATENCY_SLO_MS', 0)),
+            min_degraded_seconds=float(os.getenv('PREDICT_MIN_DEGRADED_SECONDS', 5)),
+            retry_after=int(os.getenv('PREDICT_RETRY_AFTER', 1))
+        )
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _check_rate_limit(self, client_id):
+        """
+        Apply the client's token bucket.
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until the client may retry
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._buckets = {k: b for k, b in self._buckets.items() if not b.is_full(now)}
+                bucket = self._buckets[client_id] = TokenBucket(self.rate_limit, self.rate_burst)
+            return bucket.consume(now)
+
+    def admit(self, client_id, request_start=None):
+        """
+        Decide whether a request may be processed.
+
+        Callers that are admitted must call release() once the request is done.
+
+        Args:
+            client_id (str): Identifier used for per-client rate limiting
+            request_start (float): Unix time the request entered the proxy queue, if known
+
+        Returns:
+            Rejection: None if admitted, otherwise why the request was rejected
+        """
+        # Per-client rate limiting
+        if self.rate_limit > 0:
+            wait = self._check_rate_limit(client_id)
+            if wait > 0:
+                self._count('rate_limited')
+                return Rejection(429, 'Rate limit exceeded', max(1, math.ceil(wait)))
+
+        # Shed requests that already spent their queue budget upstream
+        queued_ms = 0.0
+        if request_start is not None:
+            queued_ms = max(0.0, (time.time() - request_start) * 1000)
+        if self.max_queue_ms > 0 and queued_ms >= self.max_queue_ms:
+            self._count('shed_queue_time')
+            return Rejection(503, 'Server overloaded', self.retry_after)
+
+        # Wait for a processing slot for the rest of the queue budget
+        if self._slots is not None:
+            timeout = (self.max_queue_ms - queued_ms) / 1000 if self.max_queue_ms > 0 else None
+            if not self._slots.acquire(timeout=timeout):
+                self._count('shed_concurrency')
+                return Rejection(503, 'Server overloaded', self.retry_after)
+
+        with self._lock:
+            self.counters['admitted'] += 1
+            self.in_flight += 1
+        return None
+
+    def should_degrade(self):
+        """
+        Decide whether an admitted request should be served in degraded mode.
+
+        Returns:
+            bool: True to serve degraded, False to run the full pipeline
+                (always False outside degraded mode; periodically False
+                inside it so that full-pipeline latency keeps being measured)
+        """
+        with self._lock:
+            if not self.degraded:
+                return False
+            self._degraded_requests += 1
+            now = time.monotonic()
+            if (self._degraded_requests % self.probe_interval == 0
+                    or now - self._last_probe >= self.min_degraded_seconds):
+                self._last_probe = now
+                return False
+            return True
+
+    def release(self, latency_ms, full_pipeline=True):
+        """
+        Release the slot of an admitted request and record its latency.
+
+        Args:
+            latency_ms (float): Time spent processing the request
+            full_pipeline (bool): Whether the request ran the full pipeline;
+                degraded requests are not recorded, as their short latencies
+                would switch degraded mode off while still overloaded
+        """
+        if self._slots is not None:
+            self._slots.release()
+
+        with self._lock:
+            self.in_flight -= 1
+            if not full_pipeline:
+                return
+            self._latencies.append(latency_ms)
+
+            if self.latency_slo_ms <= 0:
+                return
+            now = time.monotonic()
+            
+            # Enter degraded mode above the SLO
+            if not self.degraded:
+                if len(self._latencies) >= 20 and self._percentile(95) > self.latency_slo_ms:
+                    self.degraded = True
+                    self._degraded_since = self._last_probe = now
+                    self._degraded_requests = 0
+                    # Judge recovery on probe requests only
+                    self._latencies.clear()
+                return
+            
+            # Leave it once comfortably below; after the minimum hold time,
+            # judge on however many probes have arrived rather than waiting
+            # for a full window, which can take long after traffic drops
+            if now - self._degraded_since >= self.min_degraded_seconds:
+                if self._percentile(95) < 0.8 * self.latency_slo_ms:
+                    self.degraded = False
+
+    def record_degraded(self, stored):
+        """
+        Count a request served in degraded mode.
+
+        Args:
+            stored (bool): True if a stored prediction was served, False if
+                the prediction was computed but not persisted
+        """
+        self._count('degraded_stored' if stored else 'degraded_unpersisted')
+
+    def _percentile(self, q):
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
+
+    def snapshot(self):
+        """
+        Get the current admission metrics.
+
+        Returns:
+            dict: Counters, in-flight requests, degraded flag and latency percentiles
+        """
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'in_flight': self.in_flight,
+                'degraded': self.degraded,
+                'latency_ms': {
+                    'p50': round(self._percentile(50), 2),
+                    'p95': round(self._percentile(95), 2),
+                    'p99': round(self._percentile(99), 2)
+                },
+                'limits': {
+                    'max_concurrency': self.max_concurrency,
+                    'max_queue_ms': self.max_queue_ms,
+                    'rate_limit': self.rate_limit,
+                    'rate_burst': self.rate_burst,
+                    'latency_slo_ms': self.latency_slo_ms
+                }
+            }
@@ -1,7 +1,34 @@
+import math
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+# Customer attributes required by /predict
+REQUIRED_FIELDS = [
+    'gender', 'age', 'tenure_months', 'contract',
+    'monthly_charge', 'internet_service'
+]
+
+# Numeric customer attributes
+NUMERIC_FIELDS = ['age', 'tenure_months', 'monthly_charge', 'total_charges', 'cltv']
+
+# Yes/No customer attributes
+BOOLEAN_FIELDS = [
+    'senior_citizen', 'married', 'dependents', 'phone_service',
+    'multiple_lines', 'online_security', 'online_backup',
+    'device_protection', 'tech_support', 'streaming_tv',
+    'streaming_movies', 'streaming_music', 'unlimited_data',
+    'paperless_billing'
+]
+
+# Known values of the categorical customer attributes
+CATEGORICAL_VALUES = {
+    'gender': ['Male', 'Female'],
+    'contract': ['Month-to-Month', 'One Year', 'Two Year'],
+    'internet_service': ['DSL', 'Fiber Optic', 'Cable', 'No'],
+    'payment_method': ['Bank Withdrawal', 'Credit Card', 'Mailed Check']
+}
+
 def validate_customer_data(data):
     """
     Validate customer data for prediction.
@@ -12,33 +39,20 @@ def validate_customer_data(data):
     Returns:
         tuple: (is_valid, error_message)
     """
-    required_fields = [
-        'gender', 'age', 'tenure_months', 'contract', 
-        'monthly_charge', 'internet_service'
-    ]
-    
     # Check if all required fields are present
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         if field not in data:
             return False, f"Missing required field: {field}"
     
     # Validate data types
     try:
         # Numeric fields
-        numeric_fields = ['age', 'tenure_months', 'monthly_charge', 'total_charges']
-        for field in numeric_fields:
+        for field in NUMERIC_FIELDS:
             if field in data and data[field] is not None:
                 data[field] = float(data[field])
         
         # Boolean fields (convert 'Yes'/'No' to True/False)
-        boolean_fields = [
-            'senior_citizen', 'married', 'dependents', 'phone_service',
-            'multiple_lines', 'online_security', 'online_backup',
-            'device_protection', 'tech_support', 'streaming_tv',
-            'streaming_movies', 'streaming_music', 'unlimited_data',
-            'paperless_billing'
-        ]
-        for field in boolean_fields:
+        for field in BOOLEAN_FIELDS:
             if field in data:
                 if isinstance(data[field], str):
                     data[field] = data[field].lower() == 'yes'
@@ -47,13 +61,16 @@ def validate_customer_data(data):
     
     return True, ""
 
-def format_prediction_response(prediction_result, customer_data):
+def format_prediction_response(prediction_result, customer_data, source='model'):
     """
     Format the prediction result for API response.
     
     Args:
-        prediction_result (dict): Prediction result from the model
+        prediction_result (dict): Prediction result from the model, or a stored
+            prediction including its 'prediction_time'
         customer_data (dict): Customer data
+        source (str): 'model' for a fresh prediction, 'stored' for a stored one
+            that ignores the request's inputs
         
     Returns:
         dict: Formatted response
@@ -76,8 +93,9 @@ def format_prediction_response(prediction_result, customer_data):
             'churn_probability': prediction_result['churn_probability'],
             'churn_probability_percent': f"{churn_probability_percent}%",
             'risk_segment': prediction_result['risk_segment'],
-            'prediction_time': datetime.now().isoformat(),
-            'model_version': prediction_result['model_version']
+            'prediction_time': (prediction_result.get('prediction_time') or datetime.now()).isoformat(),
+            'model_version': prediction_result['model_version'],
+            'source': source
         },
         'retention_strategies': formatted_strategies,
         'customer_data': {
@@ -145,4 +163,182 @@ def prepare_customer_data_for_db(data):
         if field in db_data and isinstance(db_data[field], str):
             db_data[field] = db_data[field].lower() == 'yes'
     
-    return db_data 
\ No newline at end of file
+    return db_data 
+
+def validate_search_params(args):
+    """
+    Validate and convert query parameters for customer search.
+    
+    Args:
+        args (dict): Query string parameters
+        
+    Returns:
+        tuple: (is_valid, error_message, search_params)
+    """
+    sort_fields = ['churn_probability', 'cltv', 'prediction_time']
+    
+    params = {
+        'risk_segment': args.get('risk_segment'),
+        'contract': args.get('contract'),
+        'sort_by': args.get('sort', 'churn_probability'),
+        'order': args.get('order', 'desc').lower(),
+        'cursor': args.get('cursor')
+    }
+    
+    # Validate sort options
+    if params['sort_by'] not in sort_fields:
+        return False, f"Invalid sort field: {params['sort_by']}. Must be one of {', '.join(sort_fields)}", None
+    if params['order'] not in ('asc', 'desc'):
+        return False, f"Invalid order: {params['order']}. Must be 'asc' or 'desc'", None
+    
+    # Numeric range filters
+    try:
+        numeric_fields = ['min_cltv', 'max_cltv', 'min_probability', 'max_probability']
+        for field in numeric_fields:
+            value = args.get(field)
+            params[field] = float(value) if value not in (None, '') else None
+            if params[field] is not None and not math.isfinite(params[field]):
+                return False, f"Invalid {field}: must be a finite number", None
+        
+        params['limit'] = int(args.get('limit', 50))
+    except ValueError as e:
+        return False, f"Invalid data type: {str(e)}", None
+    
+    if not 1 <= params['limit'] <= 500:
+        return False, "Invalid limit: must be between 1 and 500", None
+    
+    return True, "", params
+
+
+def _is_finite_number(value):
+    """
+    Check whether a value converts to a finite float (booleans excluded).
+    """
+    try:
+        return not isinstance(value, bool) and math.isfinite(float(value))
+    except (TypeError, ValueError):
+        return False
+
+def validate_scenario_request(data, max_scenarios=10000, feature_names=None):
+    """
+    Validate a what-if scenario request.
+    
+    The request holds the customer data and a perturbation grid mapping each
+    attribute to a list of values, or for numeric attributes to
+    {"scale": [factors]} relative to the customer's current value.
+    
+    Args:
+        data (dict): Request body with 'customer' and 'perturbations'
+        max_scenarios (int): Maximum number of scenarios in the grid
+        feature_names (list): Fields the model uses; defaults to all known
+            numeric, boolean and categorical fields
+        
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('customer'), dict):
+        return False, "Missing required field: customer"
+    
+    is_valid, error_message = validate_customer_data(data['customer'])
+    if not is_valid:
+        return False, error_message
+    
+    perturbations = data.get('perturbations')
+    if not isinstance(perturbations, dict) or not perturbations:
+        return False, "Missing required field: perturbations"
+    
+    if feature_names is None:
+        feature_names = NUMERIC_FIELDS + BOOLEAN_FIELDS + list(CATEGORICAL_VALUES)
+    
+    # Every scenario row inherits the customer's numeric values, and the
+    # model cannot score missing ones
+    for field in NUMERIC_FIELDS:
+        if field in REQUIRED_FIELDS or (field in feature_names and field in data['customer']):
+            value = data['customer'].get(field)
+            if not _is_finite_number(value):
+                return False, f"Invalid value for customer {field}: {value!r} (expected a finite number)"
+    
+    grid_size = 1
+    for field, spec in perturbations.items():
+        # Perturbing a field the model does not use would silently change nothing
+        if field not in feature_names:
+            return False, f"Unknown perturbation field: {field} (model uses: {', '.join(feature_names)})"
+        
+        if isinstance(spec, dict):
+            if field not in NUMERIC_FIELDS:
+                return False, f"Scaling is only supported for numeric fields: {', '.join(NUMERIC_FIELDS)}"
+            base_value = data['customer'].get(field)
+            if base_value is None:
+                return False, f"Cannot scale missing field: {field}"
+            if not _is_finite_number(base_value):
+                return False, f"Cannot scale non-numeric value of {field}: {base_value!r}"
+            values = spec.get('scale')
+        else:
+            values = spec
+        
+        if not isinstance(values, list) or not values:
+            return False, f"Perturbation for {field} must be a non-empty list of values"
+        
+        if field in NUMERIC_FIELDS:
+            for value in values:
+                if not _is_finite_number(value):
+                    return False, f"Invalid value for {field}: {value!r} (expected a finite number)"
+            if isinstance(spec, dict):
+                for value in values:
+                    if not math.isfinite(float(base_value) * float(value)):
+                        return False, f"Scaled value of {field} is out of range: {value!r}"
+        elif field in BOOLEAN_FIELDS:
+            for value in values:
+                if not isinstance(value, bool) and str(value).lower() not in ('yes', 'no'):
+                    return False, f"Invalid value for {field}: {value!r} (expected true/false or Yes/No)"
+        elif field in CATEGORICAL_VALUES:
+            for value in values:
+                if value not in CATEGORICAL_VALUES[field]:
+                    return False, (f"Invalid value for {field}: {value!r} "
+                                   f"(expected one of: {', '.join(CATEGORICAL_VALUES[field])})")
+        
+        grid_size *= len(values)
+    
+    if grid_size > max_scenarios:
+        return False, f"Too many scenarios: {grid_size} (maximum {max_scenarios})"
+    
+    return True, ""
+
+def build_scenario_grid(customer_data, perturbations):
+    """
+    Expand a customer and a perturbation grid into one row per scenario.
+    
+    Args:
+        customer_data (dict): Validated customer data
+        perturbations (dict): Validated perturbation grid
+        
+    Returns:
+        tuple: (pd.DataFrame of scenario rows, dict of perturbed field -> value per row)
+    """
+    # Resolve each axis to concrete values
+    axes = {}
+    for field, spec in perturbations.items():
+        if isinstance(spec, dict):
+            values = float(customer_data[field]) * np.asarray(spec['scale'], dtype=float)
+        elif field in NUMERIC_FIELDS:
+            values = np.asarray(spec, dtype=float)
+        elif field in BOOLEAN_FIELDS:
+            values = np.array([v.lower() == 'yes' if isinstance(v, str) else bool(v) for v in spec])
+        else:
+            values = np.asarray(spec, dtype=object)
+        axes[field] = values
+    
+    # Cartesian product of axis indices, one column per axis
+    shape = [len(values) for values in axes.values()]
+    indices = np.indices(shape).reshape(len(shape), -1)
+    num_scenarios = indices.shape[1]
+    
+    # Repeat the base customer and overwrite the perturbed columns
+    base = pd.DataFrame([customer_data])
+    df = base.loc[np.zeros(num_scenarios, dtype=int)].reset_index(drop=True)
+    changes = {}
+    for axis, (field, values) in enumerate(axes.items()):
+        changes[field] = values[indices[axis]]
+        df[field] = changes[field]
+    
+    return df, changes
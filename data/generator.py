@@ -0,0 +1,452 @@
+"""
+Scalable, deterministic synthetic Telco customer churn data generator.
+
+Rows are produced in fixed-size chunks, each seeded from (seed, first
+CustomerID, chunk index), so a given seed, start id and chunk size always
+yields the same dataset no matter how many worker processes generate it,
+while appends at a new start id get fresh customers. Output can be written as CSV, Parquet,
+rows in the `customers` table, or JSON lines of `/predict` request bodies.
+
+Usage:
+    python data/generator.py --rows 10000000 --format csv --output processed/customers_10m.csv
+    python data/generator.py --rows 100000 --format payloads --output payloads.jsonl
+    python data/generator.py --rows 1000000 --format db --database-url sqlite:///churn_prediction.db
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_CHURN_RATIO = 0.265
+DEFAULT_CHUNK_SIZE = 250000
+
+YES_NO = ['Yes', 'No']
+CITIES = ['San Diego', 'Los Angeles', 'San Francisco']
+OFFERS = ['None', 'Offer A', 'Offer B', 'Offer C', 'Offer D', 'Offer E']
+INTERNET_SERVICES = ['DSL', 'Fiber Optic', 'Cable', 'No']
+CONTRACTS = ['Month-to-Month', 'One Year', 'Two Year']
+PAYMENT_METHODS = ['Bank Withdrawal', 'Credit Card', 'Mailed Check']
+SATISFACTION_LABELS = ['Very Unsatisfied', 'Unsatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+CHURN_CATEGORIES = ['Attitude', 'Competitor', 'Dissatisfaction', 'Other', 'Price']
+CHURN_REASONS = [
+    'Attitude of support person',
+    'Competitor had better devices',
+    'Competitor made better offer',
+    'Competitor offered higher download speeds',
+    'Competitor offered more data',
+    'Don\'t know',
+    'Moved',
+    'Price too high',
+    'Product dissatisfaction',
+    'Service dissatisfaction'
+]
+
+# Yes/No service columns drawn uniformly
+SERVICE_FLAGS = [
+    'Phone Service', 'Multiple Lines', 'Online Security', 'Online Backup',
+    'Device Protection Plan', 'Premium Tech Support', 'Streaming TV',
+    'Streaming Movies', 'Streaming Music', 'Unlimited Data', 'Paperless Billing'
+]
+
+# Derived string columns depend only on the row index modulo a small period,
+# so they are looked up from precomputed tables instead of formatted per row
+LAT_LONG = np.array([f"{33 + i % 5}.{i}, -{117 + i % 5}.{i}" for i in range(100)], dtype=object)
+LATITUDE = np.array([33 + i % 5 + i / 100 for i in range(100)])
+LONGITUDE = np.array([-117 - i % 5 - i / 100 for i in range(100)])
+CHURN_SCORE_CATEGORY = np.array([f"{i * 10 + 1}-{(i + 1) * 10}" for i in range(10)], dtype=object)
+CLTV_CATEGORY = np.array([f"{2000 + i * 500}-{2500 + i * 500}" for i in range(10)], dtype=object)
+
+# Column layout of the combined dataset and of each raw table
+DEMOGRAPHICS_COLUMNS = [
+    'CustomerID', 'Count', 'Gender', 'Age', 'Senior Citizen', 'Married',
+    'Dependents', 'Number of Dependents'
+]
+LOCATION_COLUMNS = [
+    'CustomerID', 'Count', 'Country', 'State', 'City', 'Zip Code', 'Lat Long',
+    'Latitude', 'Longitude'
+]
+SERVICES_COLUMNS = [
+    'CustomerID', 'Count', 'Quarter', 'Referred a Friend', 'Number of Referrals',
+    'Tenure in Months', 'Offer', 'Phone Service', 'Avg Monthly Long Distance Charges',
+    'Multiple Lines', 'Internet Service', 'Avg Monthly GB Download', 'Online Security',
+    'Online Backup', 'Device Protection Plan', 'Premium Tech Support', 'Streaming TV',
+    'Streaming Movies', 'Streaming Music', 'Unlimited Data', 'Contract',
+    'Paperless Billing', 'Payment Method', 'Monthly Charge', 'Total Charges',
+    'Total Refunds', 'Total Extra Data Charges', 'Total Long Distance Charges'
+]
+STATUS_COLUMNS = [
+    'CustomerID', 'Count', 'Quarter', 'Satisfaction Score', 'Satisfaction Score Label',
+    'Customer Status', 'Churn Label', 'Churn Value', 'Churn Score',
+    'Churn Score Category', 'CLTV', 'CLTV Category', 'Churn Category', 'Churn Reason'
+]
+COMBINED_COLUMNS = list(dict.fromkeys(
+    DEMOGRAPHICS_COLUMNS + LOCATION_COLUMNS + SERVICES_COLUMNS + STATUS_COLUMNS
+))
+
+# Combined dataset column -> /predict field and customers table column
+API_FIELDS = {
+    'Gender': 'gender',
+    'Age': 'age',
+    'Senior Citizen': 'senior_citizen',
+    'Married': 'married',
+    'Dependents': 'dependents',
+    'Number of Dependents': 'number_of_dependents',
+    'Tenure in Months': 'tenure_months',
+    'Phone Service': 'phone_service',
+    'Multiple Lines': 'multiple_lines',
+    'Internet Service': 'internet_service',
+    'Online Security': 'online_security',
+    'Online Backup': 'online_backup',
+    'Device Protection Plan': 'device_protection',
+    'Premium Tech Support': 'tech_support',
+    'Streaming TV': 'streaming_tv',
+    'Streaming Movies': 'streaming_movies',
+    'Streaming Music': 'streaming_music',
+    'Unlimited Data': 'unlimited_data',
+    'Contract': 'contract',
+    'Paperless Billing': 'paperless_billing',
+    'Payment Method': 'payment_method',
+    'Monthly Charge': 'monthly_charge',
+    'Total Charges': 'total_charges',
+    'Satisfaction Score': 'satisfaction_score',
+    'CLTV': 'cltv'
+}
+BOOLEAN_FIELDS = [
+    'senior_citizen', 'married', 'dependents', 'phone_service', 'multiple_lines',
+    'online_security', 'online_backup', 'device_protection', 'tech_support',
+    'streaming_tv', 'streaming_movies', 'streaming_music', 'unlimited_data',
+    'paperless_billing'
+]
+
+def _choice(rng, categories, size, p=None):
+    """
+    Draw a categorical column without materializing one string per row.
+    """
+    codes = rng.choice(len(categories), size=size, p=p)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+def generate_chunk(start_id, num_rows, seed=None, chunk_index=0, churn_ratio=DEFAULT_CHURN_RATIO):
+    """
+    Generate one chunk of the combined customer dataset.
+
+    Args:
+        start_id (int): CustomerID of the first row, mixed into the seed
+        num_rows (int): Number of rows to generate
+        seed (int): Base random seed (None for non-deterministic output)
+        chunk_index (int): Index of the chunk, mixed into the seed
+        churn_ratio (float): Fraction of churned customers
+
+    Returns:
+        pd.DataFrame: Rows in the combined dataset layout
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(start_id, chunk_index)))
+    n = num_rows
+    customer_ids = np.arange(start_id, start_id + n)
+    row_index = customer_ids - 1
+
+    churned = rng.random(n) < churn_ratio
+    status_codes = np.where(churned, 0, rng.integers(1, 3, size=n))
+
+    data = {
+        'CustomerID': customer_ids,
+        'Count': np.ones(n, dtype=np.int8),
+        'Gender': _choice(rng, ['Male', 'Female'], n),
+        'Age': rng.integers(18, 80, size=n),
+        'Senior Citizen': _choice(rng, ['No', 'Yes'], n, p=[0.8, 0.2]),
+        'Married': _choice(rng, YES_NO, n),
+        'Dependents': _choice(rng, YES_NO, n),
+        'Number of Dependents': rng.integers(0, 5, size=n),
+        'Country': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), ['United States']),
+        'State': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), ['California']),
+        'City': _choice(rng, CITIES, n),
+        'Zip Code': rng.integers(92000, 92100, size=n),
+        'Lat Long': LAT_LONG[row_index % 100],
+        'Latitude': LATITUDE[row_index % 100],
+        'Longitude': LONGITUDE[row_index % 100],
+        'Quarter': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), ['Q3']),
+        'Referred a Friend': _choice(rng, YES_NO, n),
+        'Number of Referrals': rng.integers(0, 5, size=n),
+        'Tenure in Months': rng.integers(1, 72, size=n),
+        'Offer': _choice(rng, OFFERS, n),
+        'Avg Monthly Long Distance Charges': rng.integers(0, 50, size=n),
+        'Internet Service': _choice(rng, INTERNET_SERVICES, n),
+        'Avg Monthly GB Download': rng.integers(0, 1000, size=n),
+        'Contract': _choice(rng, CONTRACTS, n),
+        'Payment Method': _choice(rng, PAYMENT_METHODS, n),
+        'Monthly Charge': rng.uniform(50, 150, size=n).round(2),
+        'Total Charges': rng.uniform(100, 8000, size=n).round(2),
+        'Total Refunds': rng.uniform(0, 20, size=n).round(2),
+        'Total Extra Data Charges': rng.uniform(0, 30, size=n).round(2),
+        'Total Long Distance Charges': rng.uniform(0, 50, size=n).round(2),
+        'Satisfaction Score': rng.integers(1, 6, size=n),
+        'Satisfaction Score Label': _choice(rng, SATISFACTION_LABELS, n),
+        'Customer Status': pd.Categorical.from_codes(status_codes, ['Churned', 'Stayed', 'Joined']),
+        'Churn Label': pd.Categorical.from_codes(np.where(churned, 0, 1), YES_NO),
+        'Churn Value': churned.astype(np.int8),
+        'Churn Score': rng.integers(1, 101, size=n),
+        'Churn Score Category': CHURN_SCORE_CATEGORY[row_index % 10],
+        'CLTV': rng.integers(2000, 7000, size=n),
+        'CLTV Category': CLTV_CATEGORY[row_index % 10],
+        'Churn Category': _choice(rng, CHURN_CATEGORIES, n),
+        'Churn Reason': _choice(rng, CHURN_REASONS, n)
+    }
+    for column in SERVICE_FLAGS:
+        data[column] = _choice(rng, YES_NO, n)
+
+    return pd.DataFrame(data, columns=COMBINED_COLUMNS)
+
+def split_tables(combined):
+    """
+    Split the combined dataset into the raw demographics, location, services and status tables.
+
+    Args:
+        combined (pd.DataFrame): Combined dataset
+
+    Returns:
+        dict: Table name -> DataFrame
+    """
+    return {
+        'demographics': combined[DEMOGRAPHICS_COLUMNS],
+        'location': combined[LOCATION_COLUMNS],
+        'services': combined[SERVICES_COLUMNS],
+        'status': combined[STATUS_COLUMNS]
+    }
+
+def generate_population():
+    """
+    Generate the zip code population table.
+
+    Returns:
+        pd.DataFrame: Population by zip code
+    """
+    return pd.DataFrame({
+        'ID': np.arange(1, 101),
+        'Zip Code': 92000 + np.arange(100),
+        'Population': 10000 + np.arange(100) * 1000
+    })
+
+def to_api_records(chunk):
+    """
+    Convert combined dataset rows to `/predict` request bodies.
+
+    Args:
+        chunk (pd.DataFrame): Combined dataset rows
+
+    Returns:
+        pd.DataFrame: One column per API field, booleans as True/False
+    """
+    records = pd.DataFrame({'customer_id': chunk['CustomerID'].astype(str)})
+    for column, field in API_FIELDS.items():
+        if field in BOOLEAN_FIELDS:
+            records[field] = np.asarray(chunk[column] == 'Yes')
+        else:
+            records[field] = chunk[column]
+    return records
+
+def _generate_part(task):
+    """
+    Generate one chunk and serialize it for the requested output format.
+
+    Runs in a worker process; CSV and JSON text is rendered here so that
+    formatting is parallelized, and Parquet parts are written directly.
+    """
+    chunk_index, start_id, num_rows, seed, churn_ratio, output_format, output = task
+    chunk = generate_chunk(start_id, num_rows, seed, chunk_index, churn_ratio)
+
+    if output_format == 'csv':
+        return chunk.to_csv(index=False, header=chunk_index == 0)
+    if output_format == 'parquet':
+        chunk.to_parquet(Path(output) / f"part-{chunk_index:05d}.parquet", index=False)
+        return None
+    if output_format == 'payloads':
+        return to_api_records(chunk).to_json(orient='records', lines=True)
+    if output_format == 'db':
+        return to_api_records(chunk)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+def _next_customer_id(engine):
+    """
+    Get the first customers table id not yet in use.
+    """
+    from sqlalchemy import func, select
+    from backend.database.models import Customer
+
+    with engine.connect() as conn:
+        return (conn.execute(select(func.max(Customer.id))).scalar() or 0) + 1
+
+def _check_customer_ids(engine, start_id, num_rows, batch_size=10000):
+    """
+    Make sure none of the customer IDs to be generated already exist.
+
+    Raises:
+        ValueError: If any customer_id in the range is taken
+    """
+    from sqlalchemy import func, select
+    from backend.database.models import Customer
+
+    with engine.connect() as conn:
+        for offset in range(0, num_rows, batch_size):
+            batch = [str(customer_id) for customer_id in
+                     range(start_id + offset, start_id + min(offset + batch_size, num_rows))]
+            taken = conn.execute(
+                select(func.count()).select_from(Customer).where(Customer.customer_id.in_(batch))
+            ).scalar()
+            if taken:
+                raise ValueError(
+                    f"Customer IDs {start_id}-{start_id + num_rows - 1} overlap existing customers "
+                    f"(from {batch[0]}); choose another --start-id"
+                )
+
+def _insert_customers(engine, records, inserted=0):
+    """
+    Bulk insert API-shaped records into the customers table.
+
+    Args:
+        engine (Engine): Database engine
+        records (pd.DataFrame): API-shaped customer records
+        inserted (int): Rows already inserted by this run, reported on failure
+
+    Raises:
+        ValueError: If a generated customer_id already exists
+    """
+    from sqlalchemy import insert
+    from sqlalchemy.exc import IntegrityError
+    from backend.database.models import Customer
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(Customer), records.to_dict(orient='records'))
+    except IntegrityError:
+        raise ValueError(
+            f"Customer IDs {records['customer_id'].iloc[0]}-{records['customer_id'].iloc[-1]} "
+            f"overlap existing customers ({inserted:,} rows of this run were already inserted); "
+            f"choose another --start-id"
+        ) from None
+
+def generate(num_rows, output_format='csv', output=None, seed=None, churn_ratio=DEFAULT_CHURN_RATIO,
+             chunk_size=DEFAULT_CHUNK_SIZE, workers=None, database_url=None, start_id=None):
+    """
+    Generate a synthetic dataset and write it to the requested destination.
+
+    Args:
+        num_rows (int): Number of customers to generate
+        output_format (str): 'csv', 'parquet', 'payloads' (JSON lines) or 'db'
+        output (str): Output file (csv, payloads) or directory (parquet)
+        seed (int): Random seed for reproducible output
+        churn_ratio (float): Fraction of churned customers
+        chunk_size (int): Rows per chunk
+        workers (int): Worker processes (defaults to the CPU count)
+        database_url (str): Database URL for the 'db' format
+        start_id (int): CustomerID of the first row (defaults to 1, or for the
+            'db' format to the next unused customers table id)
+
+    Returns:
+        float: Generation throughput in rows per second
+    """
+    if not 0 <= churn_ratio <= 1:
+        raise ValueError("churn_ratio must be between 0 and 1")
+    if output_format != 'db' and output is None:
+        raise ValueError(f"An output path is required for the '{output_format}' format")
+
+    engine = None
+    if output_format == 'db':
+        from sqlalchemy import create_engine
+        sys.path.insert(0, str(ROOT_DIR))
+        from backend.database.models import Base
+
+        engine = create_engine(database_url or os.getenv('DATABASE_URL', 'sqlite:///churn_prediction.db'))
+        Base.metadata.create_all(engine)
+        if start_id is None:
+            start_id = _next_customer_id(engine)
+        # Check the whole range up front so that a collision loads nothing
+        _check_customer_ids(engine, start_id, num_rows)
+    elif output_format == 'parquet':
+        # Parts of an earlier, larger run would otherwise mix into this dataset
+        if Path(output).is_dir() and any(Path(output).iterdir()):
+            raise ValueError(f"Output directory {output} is not empty")
+        Path(output).mkdir(parents=True, exist_ok=True)
+    else:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+
+    if start_id is None:
+        start_id = 1
+    workers = workers or os.cpu_count() or 1
+
+    tasks = [
+        (index, start_id + offset, min(chunk_size, num_rows - offset), seed, churn_ratio, output_format, output)
+        for index, offset in enumerate(range(0, num_rows, chunk_size))
+    ]
+
+    start = time.perf_counter()
+    handle = open(output, 'w', newline='') if output_format in ('csv', 'payloads') else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep at most two chunks per worker in flight so that finished
+            # chunks cannot pile up in memory when writing is the bottleneck,
+            # and consume them in chunk order to keep output deterministic
+            pending = deque()
+            remaining = iter(tasks)
+            inserted = 0
+            try:
+                for task in remaining:
+                    pending.append(pool.submit(_generate_part, task))
+                    if len(pending) >= 2 * workers:
+                        break
+                while pending:
+                    part = pending.popleft().result()
+                    next_task = next(remaining, None)
+                    if next_task is not None:
+                        pending.append(pool.submit(_generate_part, next_task))
+                    if handle is not None:
+                        handle.write(part)
+                    elif engine is not None:
+                        _insert_customers(engine, part, inserted)
+                        inserted += len(part)
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+    finally:
+        if handle is not None:
+            handle.close()
+
+    return num_rows / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=7043, help='Number of customers to generate')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'payloads', 'db'], default='csv')
+    parser.add_argument('--output', help='Output file, or directory for parquet')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--churn-ratio', type=float, default=DEFAULT_CHURN_RATIO)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--start-id', type=int,
+                        help='CustomerID of the first row (default: 1, or the next unused id for --format db)')
+    parser.add_argument('--database-url', help='Database URL for --format db (default: $DATABASE_URL)')
+    args = parser.parse_args()
+
+    try:
+        throughput = generate(
+            args.rows,
+            output_format=args.format,
+            output=args.output,
+            seed=args.seed,
+            churn_ratio=args.churn_ratio,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            database_url=args.database_url,
+            start_id=args.start_id
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Generated {args.rows:,} rows as {args.format} at {throughput:,.0f} rows/sec")
+
+if __name__ == '__main__':
+    main()